@@ -27,7 +27,7 @@ linechart = LineChart(
     outline=(45, 143, 197, 256),
     pwidth=20,
     onlysrc=True,
-    npoints=len(nodes) * 5,
+    npoints='auto',
     interp='cubic',
     minh=100
 )
@@ -1,6 +1,15 @@
+from .aio import *
+from .barchart import *
+from .densitychart import *
 from .funcgraph import *
 from .graph import *
 from .linechart import *
 from .node import *
+from .palette import *
 from .piechart import *
-from .radarchart import *
\ No newline at end of file
+from .radarchart import *
+from .series import *
+from .shared import *
+from .sparkline import *
+from .spec import *
+from .text import *
\ No newline at end of file
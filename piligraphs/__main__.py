@@ -0,0 +1,102 @@
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .batch import iter_specs, read_rows, render_specs
+from .server import serve
+
+
+def _render(args: argparse.Namespace) -> None:
+    last_report = 0.0
+
+    def progress(done: int, elapsed: float) -> None:
+        nonlocal last_report
+        if elapsed - last_report >= 0.5:
+            last_report = elapsed
+            print(
+                f"\r{done} charts, {done / elapsed:.1f} charts/s", 
+                end='', 
+                file=sys.stderr
+            )
+
+    rows = read_rows(args.input, args.input_format)
+    specs = iter_specs(
+        rows,
+        args.type,
+        json.loads(args.params),
+        key=args.key,
+        weight=args.weight,
+        color=args.color
+    )
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(args.workers) as executor:
+        done = render_specs(
+            specs,
+            args.output,
+            format=args.format,
+            quality=args.quality,
+            executor=executor,
+            max_pending=args.max_pending,
+            progress=None if args.quiet else progress
+        )
+
+    if not args.quiet:
+        elapsed = time.perf_counter() - start
+        rate = done / elapsed if elapsed else 0.0
+        print(f"\r{done} charts in {elapsed:.1f}s, {rate:.1f} charts/s", file=sys.stderr)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog='piligraphs',
+        description="A Pillow extension for drawing graphs and charts."
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser(
+        'serve', 
+        help="run a local HTTP server rendering JSON chart specs"
+    )
+    serve_parser.add_argument('--host', default='127.0.0.1', help="host to listen on")
+    serve_parser.add_argument('--port', type=int, default=8000, help="port to listen on")
+    serve_parser.add_argument('--workers', type=int, default=None, help="number of worker processes")
+    serve_parser.add_argument('--cache-size', type=int, default=256, help="maximum number of cached images")
+
+    render_parser = commands.add_parser(
+        'render',
+        help="render charts from CSV or JSON Lines rows"
+    )
+    render_parser.add_argument('input', help="CSV or JSON Lines file, '-' for standard input")
+    render_parser.add_argument('-o', '--output', required=True, help="output directory")
+    render_parser.add_argument('-t', '--type', default='LineChart', help="chart class name")
+    render_parser.add_argument('-p', '--params', required=True, help="JSON object with chart parameters, e.g. the size")
+    render_parser.add_argument('--input-format', choices=('csv', 'jsonl'), default=None, help="input format, guessed from the extension by default")
+    render_parser.add_argument('--key', default='chart', help="column with the chart name")
+    render_parser.add_argument('--weight', default='weight', help="column with the node weight")
+    render_parser.add_argument('--color', default='color', help="column with the node color")
+    render_parser.add_argument('-f', '--format', default='PNG', help="image format")
+    render_parser.add_argument('-q', '--quality', type=int, default=None, help="encoding quality")
+    render_parser.add_argument('--workers', type=int, default=None, help="number of worker processes")
+    render_parser.add_argument('--max-pending', type=int, default=None, help="maximum number of charts in flight")
+    render_parser.add_argument('--quiet', action='store_true', help="do not report progress")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        print(f"Serving on http://{args.host}:{args.port}")
+        serve(args.host, args.port, workers=args.workers, cache_size=args.cache_size)
+    elif args.command == 'render':
+        try:
+            _render(args)
+        except (KeyError, TypeError, ValueError) as e:
+            parser.error(f"cannot render charts: {e}")
+        except OSError as e:
+            # the input is opened lazily, so it fails while rendering
+            parser.error(f"cannot read or write charts: {e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import Iterable
+from PIL import Image
+
+from .graph import Graph
+
+
+async def draw_many(
+    graphs: Iterable[Graph],
+    *,
+    executor: Executor | None = None,
+    limit: int | None = None
+) -> list[Image.Image]:
+    """
+    Draw graphs concurrently without blocking the event loop.
+    If any drawing fails or the call is cancelled, 
+    the pending drawings are cancelled too.
+
+    Parameters
+    ----------
+    graphs: `Iterable[Graph]`
+        Graphs to draw.
+    executor: `Executor` | `None`
+        Executor to draw in. If `None`, the loop default executor is used.
+    limit: `int` | `None`
+        Maximum number of graphs drawn at the same time.
+        If `None`, there is no limit.
+    """
+    semaphore = asyncio.Semaphore(limit) if limit else None
+
+    async def draw(graph: Graph) -> Image.Image:
+        if semaphore is None:
+            return await graph.draw_async(executor)
+        
+        async with semaphore:
+            return await graph.draw_async(executor)
+
+    tasks = [asyncio.ensure_future(draw(graph)) for graph in graphs]
+
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
@@ -0,0 +1,278 @@
+import numpy as np
+from typing import Any
+from pinkie import Color
+from PIL import Image
+
+from .graph import NodeGraph, Mode
+from .spec import GraphSpec, NO_COLOR, pack_color, unpack_color
+
+
+class BarChart(NodeGraph):
+    """
+    Class representing a bar chart.
+    Bars are filled directly in the image memory,
+    so thousands of bars cost about as much as one.
+    Bars grow from the bottom edge, so node weights
+    should not be negative.
+    """
+
+    _colored_nodes = True
+
+    def __init__(
+        self,
+        size: tuple[int, int],
+        *,
+        gap: int = 1,
+        fill: Color | int | str | tuple[int, int, int] | tuple[int, int, int, int] | None = None,
+        background: Color | int | str | tuple[int, int, int] | tuple[int, int, int, int] | None = None,
+        mode: Mode | None = 'RGBA'
+    ) -> None:
+        """
+        Parameters
+        ----------
+        size: `tuple[int, int]`
+            Image width and height.
+        gap: `int`
+            Space between the bars. Bars narrower
+            than the gap are drawn without it.
+        fill: `Color` | `None`
+            Color of bars whose node has no color.
+            If `None`, such bars are not drawn.
+        background: `Color` | `None`
+            Background color. If `None`, the background is transparent.
+        mode: `str` | `None`
+            Image mode: `RGBA`, `P` or `LA`.
+            If `None`, the most compact mode for the graph colors is used.
+        """
+        super().__init__()
+
+        self.size = size
+        self.gap = gap
+        self.fill = fill
+        self.background = background
+        self.mode = mode
+
+    @property
+    def size(self) -> tuple[int, int]:
+        """Image width and height."""
+        return self._size
+
+    @size.setter
+    def size(self, value: tuple[int, int]):
+        if len(value) != 2:
+            raise ValueError("size should contain 2 items")
+        self._size = value
+
+    @property
+    def gap(self) -> int:
+        """Space between the bars."""
+        return self._gap
+
+    @gap.setter
+    def gap(self, value: int):
+        self._gap = value
+
+    @property
+    def fill(self) -> Color | None:
+        """Color of bars without a node color."""
+        return self._auto_color(self._fill, 'fill')
+
+    @fill.setter
+    def fill(self, value: Color | int | str | tuple | None):
+        if isinstance(value, Color) or value is None or value is ...:
+            self._fill = value
+        else:
+            self._fill = Color(value)
+
+    @property
+    def colors(self) -> list[Color]:
+        colors = super().colors
+        if self.fill is not None and self.fill not in colors:
+            colors.append(self.fill)
+        return colors
+
+    def _resolution(self) -> int:
+        return max(int(self.size[0]), 1)
+
+    def _params(self) -> dict[str, Any]:
+        return super()._params() | {
+            'size': tuple(self.size),
+            'gap': self.gap,
+            'fill': pack_color(self.fill)
+        }
+
+    @classmethod
+    def _stacks(cls, spec: GraphSpec) -> tuple[np.ndarray, np.ndarray]:
+        """Bar segment weights and node indices with shape `(bars, layers)`."""
+        index = np.arange(len(spec.weights))
+        return spec.weights[:, None], index[:, None]
+
+    @classmethod
+    def _geometry(cls, spec: GraphSpec) -> dict[str, np.ndarray] | None:
+        weights, nodes = cls._stacks(spec)
+        num_bars = len(weights)
+
+        if num_bars == 0:
+            return None
+
+        w, h = spec.size
+
+        if np.any(weights < 0):
+            raise ValueError("bar weights should not be negative")
+
+        # cumulative tops of the segments in pixels,
+        # zero is at the bottom and the highest top at the top edge
+        tops = np.cumsum(weights, axis=1)
+        highest = tops.max()
+        heights = tops * (h / highest) if highest > 0 else np.zeros_like(tops)
+        heights = np.round(heights).astype(np.int64)
+
+        # columns covered by every bar
+        edges = np.floor(np.linspace(0, w, num_bars + 1)).astype(np.int64)
+        widths = np.diff(edges)
+        widths = np.where(widths > spec.gap, widths - spec.gap, widths)
+        widths = np.maximum(widths, 1)
+        bars = np.repeat(np.arange(num_bars), widths)
+        columns = np.minimum(
+            np.repeat(edges[:-1], widths) + np.arange(len(bars))
+            - np.repeat(np.cumsum(widths) - widths, widths),
+            w - 1
+        )
+
+        # with more bars than columns, the highest bar takes the column
+        order = np.argsort(heights[bars, -1], kind='stable')
+        column_bars = np.full(w, -1, dtype=np.int64)
+        column_bars[columns[order]] = bars[order]
+
+        # node colors as indices into the graph palette,
+        # the last item is for nodes padding the last stack
+        fill = spec.params.get('fill')
+        packed = spec.colors if fill is None else np.where(spec.colors == NO_COLOR, fill, spec.colors)
+        known = packed != NO_COLOR
+        palette = np.array(spec.palette, dtype=np.int64)
+        sorter = np.argsort(palette)
+        node_colors = np.full(len(packed) + 1, -1, dtype=np.int64)
+        node_colors[:-1][known] = sorter[np.searchsorted(palette, packed[known], sorter=sorter)]
+
+        covered = column_bars >= 0
+        bounds = np.zeros((weights.shape[1], w), dtype=np.int64)
+        colors = np.full((weights.shape[1], w), -1, dtype=np.int64)
+        bounds[:, covered] = heights[column_bars[covered]].T
+        colors[:, covered] = node_colors[nodes[column_bars[covered]]].T
+
+        return {'bounds': bounds, 'colors': colors}
+
+    @classmethod
+    def _rasterize(
+        cls,
+        spec: GraphSpec,
+        geometry: dict[str, np.ndarray] | None,
+        box: tuple[int, int, int, int]
+    ) -> Image.Image:
+        x0, y0, x1, y1 = box
+        template, ink = cls._new_image(spec, (0, 0))
+
+        # whole pixels are packed into integers, the last one is the background
+        lut = np.array(
+            [ink(unpack_color(c)) for c in (*spec.palette, spec.params.get('background'))],
+            dtype=np.uint8
+        ).reshape(len(spec.palette) + 1, -1)
+        lut = lut.view(f'<u{lut.shape[1]}')[:, 0]
+        background = lut[-1]
+
+        if geometry is None:
+            pixels = np.full((y1 - y0, x1 - x0), background)
+        else:
+            h = spec.size[1]
+            bounds = geometry['bounds'][:, x0:x1]
+            colors = geometry['colors'][:, x0:x1]
+            pad = x1 - x0 - bounds.shape[1]
+            bounds = np.pad(bounds, ((0, 0), (0, pad))).astype(np.int32)
+            colors = np.pad(colors, ((0, 0), (0, pad)), constant_values=-1)
+
+            # pixel heights above the bottom edge for every row of the box
+            levels = (h - np.arange(y0, y1, dtype=np.int32))[:, None]
+
+            # segments are painted from the top one down, each over the whole 
+            # column below its top, so a layer of all bars costs one comparison
+            # and one select; segments without a color (-1) get the background
+            pixels = np.where(levels <= bounds[-1], lut[colors[-1]], background)
+            for bound, color in zip(bounds[-2::-1], colors[-2::-1]):
+                np.copyto(pixels, lut[color], where=levels <= bound)
+
+        mode = template.mode
+        image = Image.frombuffer(mode, (x1 - x0, y1 - y0), pixels, 'raw', mode, 0, 1)
+        if mode == 'P':
+            image.putpalette(template.getpalette('RGBA'), 'RGBA')
+
+        return image
+
+
+class StackedBarChart(BarChart):
+    """
+    Class representing a stacked bar chart.
+    Every `layers` consecutive nodes make one bar,
+    from the bottom segment to the top one.
+    """
+
+    def __init__(
+        self,
+        size: tuple[int, int],
+        *,
+        layers: int,
+        gap: int = 1,
+        fill: Color | int | str | tuple[int, int, int] | tuple[int, int, int, int] | None = None,
+        background: Color | int | str | tuple[int, int, int] | tuple[int, int, int, int] | None = None,
+        mode: Mode | None = 'RGBA'
+    ) -> None:
+        """
+        Parameters
+        ----------
+        size: `tuple[int, int]`
+            Image width and height.
+        layers: `int`
+            Number of segments in a bar.
+        gap: `int`
+            Space between the bars. Bars narrower
+            than the gap are drawn without it.
+        fill: `Color` | `None`
+            Color of segments whose node has no color.
+            If `None`, such segments are not drawn.
+        background: `Color` | `None`
+            Background color. If `None`, the background is transparent.
+        mode: `str` | `None`
+            Image mode: `RGBA`, `P` or `LA`.
+            If `None`, the most compact mode for the graph colors is used.
+        """
+        super().__init__(size, gap=gap, fill=fill, background=background, mode=mode)
+
+        self.layers = layers
+
+    @property
+    def layers(self) -> int:
+        """Number of segments in a bar."""
+        return self._layers
+
+    @layers.setter
+    def layers(self, value: int):
+        if value < 1:
+            raise ValueError("layers should be positive")
+        self._layers = value
+
+    def _resolution(self) -> None:
+        # reduced series would mix the segments of different bars
+        return None
+
+    def _params(self) -> dict[str, Any]:
+        return super()._params() | {'layers': self.layers}
+
+    @classmethod
+    def _stacks(cls, spec: GraphSpec) -> tuple[np.ndarray, np.ndarray]:
+        layers = spec.layers
+        num_nodes = len(spec.weights)
+        num_bars = -(-num_nodes // layers)
+        index = np.arange(num_bars * layers)
+        weights = np.zeros(num_bars * layers)
+        weights[:num_nodes] = spec.weights
+        index[num_nodes:] = -1
+        return weights.reshape(-1, layers), index.reshape(-1, layers)
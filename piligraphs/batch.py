@@ -0,0 +1,200 @@
+import csv
+import io
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import (
+    Executor, 
+    FIRST_COMPLETED, 
+    Future, 
+    ProcessPoolExecutor, 
+    wait
+)
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Iterator, Literal, Mapping
+
+from .spec import GraphSpec
+
+
+RowFormat = Literal['csv', 'jsonl']
+
+_UNSAFE_CHARS = re.compile(r'[^\w.-]')
+
+
+def read_rows(
+    path: str,
+    format: RowFormat | None = None
+) -> Iterator[dict[str, Any]]:
+    """
+    Stream rows from a CSV or JSON Lines file.
+    Rows are read one by one, the file is never loaded at once.
+
+    Parameters
+    ----------
+    path: `str`
+        File path. `-` reads from the standard input.
+    format: `RowFormat` | `None`
+        File format. If `None`, it is guessed from the file extension.
+    """
+    if format is None:
+        format = 'jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv'
+    if format not in {'csv', 'jsonl'}:
+        raise ValueError(f"unsupported row format: {format}")
+
+    if path == '-':
+        file = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', newline='')
+    else:
+        file = open(path, encoding='utf-8', newline='')
+
+    with file:
+        if format == 'csv':
+            yield from csv.DictReader(file)
+        else:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def iter_specs(
+    rows: Iterable[Mapping[str, Any]],
+    type: str,
+    params: Mapping[str, Any] | None = None,
+    *,
+    key: str = 'chart',
+    weight: str = 'weight',
+    color: str = 'color'
+) -> Iterator[tuple[str, GraphSpec]]:
+    """
+    Group consecutive rows with the same key into graph specs.
+    Only one group is kept in memory at a time,
+    so rows of a graph should go one after another.
+
+    Parameters
+    ----------
+    rows: `Iterable[Mapping[str, Any]]`
+        Rows, e.g. from `read_rows`.
+    type: `str`
+        Graph class name.
+    params: `Mapping[str, Any]` | `None`
+        Graph parameters shared by all graphs.
+    key: `str`
+        Column with the graph name.
+    weight: `str`
+        Column with the node weight.
+    color: `str`
+        Column with the node color. Can be missing, then
+        nodes get the colors of `GraphSpec.from_dict`.
+    """
+    params = dict(params or {})
+
+    for name, group in groupby(rows, key=itemgetter(key)):
+        weights = []
+        colors = []
+        for row in group:
+            weights.append(float(row[weight]))
+            colors.append(row.get(color) or None)
+
+        data = {'type': type, 'params': params, 'weights': weights}
+        # without any color, graphs pick their default node colors
+        if any(c is not None for c in colors):
+            data['colors'] = colors
+
+        yield str(name), GraphSpec.from_dict(data)
+
+
+def _render_file(data: bytes, path: str, format: str, quality: int | None) -> str:
+    with open(path, 'wb') as file:
+        GraphSpec.loads(data).render_bytes(format, quality=quality, fp=file)
+    return path
+
+
+def render_specs(
+    specs: Iterable[tuple[str, GraphSpec]],
+    outdir: str,
+    *,
+    format: str = 'PNG',
+    quality: int | None = None,
+    executor: Executor | None = None,
+    max_pending: int | None = None,
+    progress: Callable[[int, float], None] | None = None
+) -> int:
+    """
+    Render named specs into image files in parallel.
+    Specs are consumed lazily and at most `max_pending` renders
+    are in flight, so memory use does not depend on the input size.
+    Returns the number of rendered files.
+
+    Parameters
+    ----------
+    specs: `Iterable[tuple[str, GraphSpec]]`
+        Pairs of file name (without extension) and spec.
+        Repeated names get a `-2`, `-3`, ... suffix, so no file
+        is overwritten.
+    outdir: `str`
+        Output directory. Created if it does not exist.
+    format: `str`
+        Image format.
+    quality: `int` | `None`
+        Encoding quality.
+    executor: `Executor` | `None`
+        Executor to render in. If `None`, a process pool is used.
+    max_pending: `int` | `None`
+        Maximum number of renders in flight.
+        If `None`, equals to 4 renders per CPU.
+    progress: `Callable[[int, float], None]` | `None`
+        Called after every finished render with the number
+        of rendered files and the elapsed time in seconds.
+    """
+    os.makedirs(outdir, exist_ok=True)
+
+    own_executor = executor is None
+    executor = executor or ProcessPoolExecutor()
+    max_pending = max_pending or 4 * (os.cpu_count() or 1)
+    extension = format.lower()
+    pending: set[Future] = set()
+    filenames: set[str] = set()
+    done_count = 0
+    start = time.perf_counter()
+
+    def collect(futures: set[Future]) -> None:
+        nonlocal done_count
+        for future in futures:
+            future.result()
+            done_count += 1
+            if progress is not None:
+                progress(done_count, time.perf_counter() - start)
+
+    try:
+        for name, spec in specs:
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+
+            stem = _UNSAFE_CHARS.sub('_', name)
+            filename = f"{stem}.{extension}"
+            copy = 1
+            while filename in filenames:
+                copy += 1
+                filename = f"{stem}-{copy}.{extension}"
+            filenames.add(filename)
+
+            pending.add(executor.submit(
+                _render_file, 
+                spec.dumps(), 
+                os.path.join(outdir, filename), 
+                format, 
+                quality
+            ))
+
+        done, pending = wait(pending)
+        collect(done)
+    finally:
+        for future in pending:
+            future.cancel()
+        if own_executor:
+            executor.shutdown()
+
+    return done_count
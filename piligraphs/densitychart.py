@@ -0,0 +1,290 @@
+import numpy as np
+from typing import Any, Iterable, Literal, Sequence
+from pinkie import Color
+from PIL import Image
+
+from .graph import Graph, Mode
+from .series import CHUNK_SIZE
+from .spec import GraphSpec, pack_color, unpack_color
+
+
+Scale = Literal['linear', 'log']
+
+
+class DensityChart(Graph):
+    """
+    Class representing a density chart (heatmap) of points.
+
+    Points are binned into pixels as soon as they are added,
+    so the chart keeps only one counter per pixel
+    whatever the number of points.
+    """
+
+    def __init__(
+        self,
+        size: tuple[int, int],
+        *,
+        bounds: tuple[float, float, float, float],
+        cmap: Sequence[Color | int | str | tuple[int, int, int] | tuple[int, int, int, int]] = ('3366ff', 'ffcc00'),
+        scale: Scale = 'log',
+        background: Color | int | str | tuple[int, int, int] | tuple[int, int, int, int] | None = None,
+        mode: Mode | None = 'RGBA'
+    ) -> None:
+        """
+        Parameters
+        ----------
+        size: `tuple[int, int]`
+            Image width and height.
+        bounds: `tuple[float, float, float, float]`
+            Minimum x, minimum y, maximum x and maximum y of the plotted area.
+            Points outside of it are skipped.
+        cmap: `Sequence[Color]`
+            Colors from the lowest density to the highest one.
+            Densities between them are interpolated.
+        scale: `str`
+            Density scale: `linear` or `log`.
+        background: `Color` | `None`
+            Color of pixels without points. If `None`, they are transparent.
+        mode: `str` | `None`
+            Image mode: `RGBA`, `P` or `LA`.
+            If `None`, the most compact mode for the graph colors is used.
+        """
+        super().__init__()
+
+        self._counts = None
+        self.size = size
+        self.bounds = bounds
+        self.cmap = cmap
+        self.scale = scale
+        self.background = background
+        self.mode = mode
+
+    @property
+    def size(self) -> tuple[int, int]:
+        """Image width and height. Changing it clears the points."""
+        return self._size
+
+    @size.setter
+    def size(self, value: tuple[int, int]):
+        if len(value) != 2:
+            raise ValueError("size should contain 2 items")
+        self._size = value
+        self.clear()
+
+    @property
+    def bounds(self) -> tuple[float, float, float, float]:
+        """Plotted area. Changing it clears the points."""
+        return self._bounds
+
+    @bounds.setter
+    def bounds(self, value: tuple[float, float, float, float]):
+        if len(value) != 4:
+            raise ValueError("bounds should contain 4 items")
+        if value[0] >= value[2] or value[1] >= value[3]:
+            raise ValueError("bounds should have positive width and height")
+        self._bounds = value
+        self.clear()
+
+    @property
+    def cmap(self) -> list[Color]:
+        """Colors from the lowest density to the highest one."""
+        return self._cmap
+
+    @cmap.setter
+    def cmap(self, value: Sequence[Color | int | str | tuple]):
+        if not value:
+            raise ValueError("cmap should contain at least 1 color")
+        self._cmap = [c if isinstance(c, Color) else Color(c) for c in value]
+
+    @property
+    def scale(self) -> Scale:
+        """Density scale."""
+        return self._scale
+
+    @scale.setter
+    def scale(self, value: Scale):
+        if value not in {'linear', 'log'}:
+            raise ValueError(f"unsupported scale: {value}")
+        self._scale = value
+
+    @property
+    def counts(self) -> np.ndarray:
+        """Accumulated point weights per pixel with shape `(height, width)`."""
+        return self._counts
+
+    @property
+    def colors(self) -> list[Color]:
+        return list(dict.fromkeys(self.cmap))
+
+    def clear(self) -> None:
+        """Remove all points."""
+        w, h = self.size
+        self._counts = np.zeros((h, w), dtype=np.float64)
+
+    def add_points(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        weights: np.ndarray | None = None,
+        *,
+        chunksize: int = CHUNK_SIZE
+    ) -> None:
+        """
+        Bin points into pixels.
+        Arrays (including memory maps) are processed chunk by chunk,
+        so temporary memory does not depend on the number of points.
+
+        Parameters
+        ----------
+        x: `np.ndarray`
+            X coordinates.
+        y: `np.ndarray`
+            Y coordinates.
+        weights: `np.ndarray` | `None`
+            Point weights. If `None`, every point counts as 1.
+        chunksize: `int`
+            Number of points binned at once.
+        """
+        x = np.asarray(x).ravel()
+        y = np.asarray(y).ravel()
+
+        if len(x) != len(y):
+            raise ValueError("x and y should have the same length")
+        if weights is not None:
+            weights = np.asarray(weights).ravel()
+            if len(weights) != len(x):
+                raise ValueError("weights and points should have the same length")
+
+        for start in range(0, len(x), chunksize):
+            end = start + chunksize
+            self._bin(
+                x[start:end],
+                y[start:end],
+                None if weights is None else weights[start:end]
+            )
+
+    def add_chunks(self, chunks: Iterable[tuple[np.ndarray, ...]]) -> None:
+        """
+        Bin points from an iterable of `(x, y)` or `(x, y, weights)` chunks,
+        e.g. read from a file piece by piece.
+
+        Parameters
+        ----------
+        chunks: `Iterable[tuple[np.ndarray, ...]]`
+            Chunks of point coordinates and optional weights.
+        """
+        for chunk in chunks:
+            self.add_points(*chunk)
+
+    def _bin(self, x: np.ndarray, y: np.ndarray, weights: np.ndarray | None) -> None:
+        w, h = self.size
+        minx, miny, maxx, maxy = self.bounds
+
+        columns = np.floor((x - minx) * (w / (maxx - minx))).astype(np.int64)
+        rows = np.floor((maxy - y) * (h / (maxy - miny))).astype(np.int64)
+
+        # points on the right and bottom edges belong to the last pixels
+        columns[x == maxx] = w - 1
+        rows[y == miny] = h - 1
+
+        inside = (columns >= 0) & (columns < w) & (rows >= 0) & (rows < h)
+        index = rows[inside] * w + columns[inside]
+
+        self._counts += np.bincount(
+            index,
+            None if weights is None else weights[inside],
+            minlength=w * h
+        ).reshape(h, w)
+
+    def _params(self) -> dict[str, Any]:
+        return super()._params() | {
+            'size': tuple(self.size),
+            'bounds': tuple(self.bounds),
+            'cmap': tuple(pack_color(c) for c in self.cmap),
+            'scale': self.scale
+        }
+
+    def _data(self) -> tuple[np.ndarray, None]:
+        return self._counts.ravel().copy(), None
+
+    @classmethod
+    def _build(
+        cls,
+        params: dict[str, Any],
+        weights: Sequence[int | float],
+        colors: Sequence[Any]
+    ) -> 'DensityChart':
+        graph = cls(**params)
+        if len(weights):
+            graph._counts += np.asarray(weights, dtype=np.float64).reshape(graph._counts.shape)
+        return graph
+
+    @classmethod
+    def _resize(cls, spec: GraphSpec, size: tuple[int, int]) -> GraphSpec:
+        # counts are resampled to the new pixels, densities are
+        # relative to the densest pixel, so their total does not matter
+        w, h = spec.size
+        counts = Image.fromarray(spec.weights.reshape(h, w).astype(np.float32), 'F')
+        counts = counts.resize(tuple(size), Image.Resampling.BOX)
+        return GraphSpec(
+            spec.type,
+            spec.params | {'size': tuple(size)},
+            np.asarray(counts, dtype=np.float64).ravel()
+        )
+
+    @classmethod
+    def _geometry(cls, spec: GraphSpec) -> np.ndarray:
+        w, h = spec.size
+        counts = spec.weights.reshape(h, w)
+        max_count = counts.max(initial=0)
+
+        if spec.scale == 'log':
+            counts = np.log1p(np.maximum(counts, 0))
+            max_count = np.log1p(max(max_count, 0))
+
+        # 0 is left for pixels without points, densities take 1-255
+        levels = np.zeros((h, w), dtype=np.uint8)
+        if max_count > 0:
+            filled = counts > 0
+            levels[filled] = 1 + np.round(counts[filled] * (254 / max_count)).astype(np.uint8)
+
+        return levels
+
+    @classmethod
+    def _rasterize(
+        cls,
+        spec: GraphSpec,
+        geometry: np.ndarray,
+        box: tuple[int, int, int, int]
+    ) -> Image.Image:
+        x0, y0, x1, y1 = box
+        w, h = spec.size
+        levels = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        levels[:max(min(h, y1) - y0, 0), :max(min(w, x1) - x0, 0)] = geometry[y0:y1, x0:x1]
+
+        # color map as a lookup table, interpolated between the colors
+        cmap = np.array([unpack_color(c).rgba for c in spec.cmap], dtype=np.float64)
+        stops = np.linspace(1, 255, len(cmap)) if len(cmap) > 1 else np.ones(1)
+        lut = np.empty((256, 4), dtype=np.uint8)
+        for channel in range(4):
+            lut[:, channel] = np.round(np.interp(np.arange(256), stops, cmap[:, channel]))
+
+        background = unpack_color(spec.params.get('background'))
+        lut[0] = background.rgba if background is not None else (0, 0, 0, 0)
+
+        mode = spec.mode
+        if mode is None:
+            mode = 'P'
+        elif mode == 'LA' and (np.any(lut[:, 0] != lut[:, 1]) or np.any(lut[:, 1] != lut[:, 2])):
+            raise ValueError("LA mode requires grayscale colors")
+
+        if mode == 'P':
+            # putting a palette turns the L image into a P one
+            image = Image.fromarray(levels)
+            image.putpalette(lut.tobytes(), 'RGBA')
+            return image
+
+        if mode == 'LA':
+            return Image.fromarray(lut[levels][..., [0, 3]])
+
+        return Image.fromarray(lut[levels])
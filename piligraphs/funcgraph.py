@@ -1,9 +1,12 @@
 import numpy as np
 from pinkie import Color
-from typing import Callable
+from typing import Any, Callable
 from PIL import Image, ImageDraw
 
-from .graph import Graph
+from .graph import Graph, Mode
+from .spec import GraphSpec, pack_color
+from .text import format_tick, paste_text
+from .utils import clip_points, compile_func, to_boxes, to_points
 
 
 class FuncGraph(Graph):
@@ -41,29 +44,56 @@ class FuncGraph(Graph):
         self,
         size: tuple[int, int],
         *,
-        func: Callable[[float], float],
+        func: Callable[[float], float] | str,
         thickness: int = 1,
         outline: Color | int | str | tuple[int, int, int] | tuple[int, int, int, int] = ...,
         res: tuple[int, int] = (10, 10),
-        npoints: int | None = None
+        npoints: int | None = None,
+        axes: Color | int | str | tuple[int, int, int] | tuple[int, int, int, int] | None = None,
+        grid: Color | int | str | tuple[int, int, int] | tuple[int, int, int, int] | None = None,
+        labels: Color | int | str | tuple[int, int, int] | tuple[int, int, int, int] | None = None,
+        ticks: tuple[int, int] = (10, 10),
+        font: str | None = None,
+        fontsize: int = 10,
+        background: Color | int | str | tuple[int, int, int] | tuple[int, int, int, int] | None = None,
+        mode: Mode | None = 'RGBA'
     ) -> None:
         """
         Parameters
         ----------
         size: `tuple[int, int]`
             Image width and height.
-        func: `Callable[[float], float]`
+        func: `Callable[[float], float]` | `str`
             Function for building a graph based on.
+            Can be a math expression of `x`, e.g. `sin(x) * 2`.
         thickness: `int`
             Line thickness.
         outline: `Color`
-            Line color. If = `...`, generates a random color.
+            Line color. If = `...`, a color is generated from the graph type.
         res: `tuple[int, int]`
             Numbers of points from the center to x and y end respectively.
             Higher value = smaller scale.
         npoints: `int` | `None`
             Total number of points. Higher value = smoother result.
             If `None`, equals to image width divided by half of thickness.
+        axes: `Color` | `None`
+            Color of the axes and tick marks. If `None`, no axes will be drawn.
+            The axes cross at the origin.
+        grid: `Color` | `None`
+            Gridline color. If `None`, no grid will be drawn.
+        labels: `Color` | `None`
+            Tick label color. If `None`, no labels will be drawn.
+        ticks: `tuple[int, int]`
+            Numbers of divisions along x and y.
+        font: `str` | `None`
+            Label font path or name. If `None`, the default font is used.
+        fontsize: `int`
+            Label font size.
+        background: `Color` | `None`
+            Background color. If `None`, the background is transparent.
+        mode: `str` | `None`
+            Image mode: `RGBA`, `P` or `LA`.
+            If `None`, the most compact mode for the graph colors is used.
         """
         super().__init__()
 
@@ -73,6 +103,14 @@ class FuncGraph(Graph):
         self.outline = outline
         self.res = res
         self.npoints = npoints
+        self.axes = axes
+        self.grid = grid
+        self.labels = labels
+        self.ticks = ticks
+        self.font = font
+        self.fontsize = fontsize
+        self.background = background
+        self.mode = mode
 
     @property
     def size(self) -> tuple[int, int]:
@@ -86,12 +124,14 @@ class FuncGraph(Graph):
         self._size = value
       
     @property
-    def func(self) -> Callable[[float], float]:
-        """Graph function."""
+    def func(self) -> Callable[[float], float] | str:
+        """Graph function or its expression."""
         return self._func
     
     @func.setter
-    def func(self, value: Callable[[float], float]):
+    def func(self, value: Callable[[float], float] | str):
+        if isinstance(value, str):
+            compile_func(value)
         self._func = value
 
     @property
@@ -106,14 +146,12 @@ class FuncGraph(Graph):
     @property
     def outline(self) -> Color:
         """Line color."""
-        return self._outline
+        return self._auto_color(self._outline, 'outline')
     
     @outline.setter
     def outline(self, value: Color | int | str | tuple):
-        if isinstance(value, Color):
+        if isinstance(value, Color) or value is ...:
             self._outline = value
-        elif value is ...:
-            self._outline = Color.random()
         else:
             self._outline = Color(value)
 
@@ -137,19 +175,96 @@ class FuncGraph(Graph):
     def npoints(self, value: int | None):
         self._npoints = value
       
-    def draw(self) -> Image.Image:
-        image = Image.new('RGBA', self.size)
-        draw = ImageDraw.Draw(image)
+    @property
+    def axes(self) -> Color | None:
+        """Axis color. If `None`, no axes will be drawn."""
+        return self._axes
+    
+    @axes.setter
+    def axes(self, value: Color | int | str | tuple | None):
+        self._axes = value if isinstance(value, Color) or value is None else Color(value)
 
-        w, h = self.size
-        func = self.func
-        thickness = self.thickness
-        radius = thickness / 2
-        res_x, res_y = self.res
-        outline_rgba = self.outline.rgba
-        step = w / self.npoints if self.npoints else w / radius
+    @property
+    def grid(self) -> Color | None:
+        """Gridline color. If `None`, no grid will be drawn."""
+        return self._grid
+    
+    @grid.setter
+    def grid(self, value: Color | int | str | tuple | None):
+        self._grid = value if isinstance(value, Color) or value is None else Color(value)
+
+    @property
+    def labels(self) -> Color | None:
+        """Tick label color. If `None`, no labels will be drawn."""
+        return self._labels
+    
+    @labels.setter
+    def labels(self, value: Color | int | str | tuple | None):
+        self._labels = value if isinstance(value, Color) or value is None else Color(value)
+
+    @property
+    def ticks(self) -> tuple[int, int]:
+        """Numbers of divisions along x and y."""
+        return self._ticks
+    
+    @ticks.setter
+    def ticks(self, value: tuple[int, int]):
+        if len(value) != 2:
+            raise ValueError("ticks should contain 2 items")
+        self._ticks = value
+
+    @property
+    def font(self) -> str | None:
+        """Label font path or name."""
+        return self._font
+    
+    @font.setter
+    def font(self, value: str | None):
+        self._font = value
+
+    @property
+    def fontsize(self) -> int:
+        """Label font size."""
+        return self._fontsize
+    
+    @fontsize.setter
+    def fontsize(self, value: int):
+        self._fontsize = value
+
+    @property
+    def colors(self) -> list[Color]:
+        return [
+            c for c in (self.outline, self.axes, self.grid, self.labels) 
+            if c is not None
+        ]
+
+    def _params(self) -> dict[str, Any]:
+        return super()._params() | {
+            'size': tuple(self.size),
+            'func': self.func,
+            'thickness': self.thickness,
+            'outline': pack_color(self.outline),
+            'res': tuple(self.res),
+            'npoints': self.npoints,
+            'axes': pack_color(self.axes),
+            'grid': pack_color(self.grid),
+            'labels': pack_color(self.labels),
+            'ticks': tuple(self.ticks),
+            'font': self.font,
+            'fontsize': self.fontsize
+        }
+
+    @classmethod
+    def _shape(cls, spec: GraphSpec) -> list[np.ndarray]:
+        w = spec.size[0]
+        func = compile_func(spec.func) if isinstance(spec.func, str) else spec.func
+        radius = spec.thickness / 2
+        res_x = spec.res[0]
+        step = w / spec.npoints if spec.npoints else w / radius
         lines: list[list[tuple[float, float]]] = [[]]
         
+        # function values are sampled at the pixels of this size
+        # and kept in function coordinates
         for x in np.arange(radius, w - radius, step):
             try:
                 x_val = (x / w - 0.5) * 2 * res_x
@@ -159,33 +274,120 @@ class FuncGraph(Graph):
                     lines.append([])
                     continue
 
-                y = h - (y_val / (2 * res_y) + 0.5) * h
-                    
-                lines[-1].append((x, y))
+                lines[-1].append((x_val, float(y_val)))
             except Exception:
                 lines.append([])
+
+        return [np.array(line, dtype=np.float64) for line in lines if line]
+
+    @classmethod
+    def _place(cls, spec: GraphSpec, shape: list[np.ndarray]) -> list[np.ndarray]:
+        w, h = spec.size
+        res_x, res_y = spec.res
+        scale = np.array([w / (2 * res_x), -h / (2 * res_y)])
+        return [line * scale + (w / 2, h / 2) for line in shape]
+
+    @classmethod
+    def _rasterize(
+        cls, 
+        spec: GraphSpec, 
+        geometry: list[np.ndarray], 
+        box: tuple[int, int, int, int]
+    ) -> Image.Image:
+        x0, y0, x1, y1 = box
+        image, ink = cls._base_image(spec, box)
+        draw = ImageDraw.Draw(image)
+
+        thickness = spec.thickness
+        radius = thickness / 2
+        outline_ink = ink(spec.color('outline'))
+        offset = (x0, y0)
         
-        for line in lines:
-            if len(line) == 0:
+        for line in geometry:
+            if line[-1, 0] < x0 - thickness or line[0, 0] > x1 + thickness:
                 continue
-            
+
             draw.line(
-                line,
-                fill=outline_rgba, 
+                to_points(clip_points(line, x0 - thickness, x1 + thickness), offset),
+                fill=outline_ink, 
                 width=thickness, 
                 joint='curve'
             )
 
-            for x, y in (line[0], line[-1]):
-                draw.ellipse(
-                    (
-                        (x - radius, y - radius),
-                        (x + radius, y + radius)
-                    ),
-                    fill=outline_rgba,
-                    width=0
-                )
+            for box in to_boxes(line[[0, -1]], radius, offset):
+                draw.ellipse(box, fill=outline_ink, width=0)
+
+        cls._draw_labels(spec, image, ink, offset)
         
         return image
 
+    @staticmethod
+    def _ticks(spec: GraphSpec) -> tuple[np.ndarray, np.ndarray]:
+        w, h = spec.size
+        nx, ny = spec.ticks
+        return np.linspace(0, w, nx + 1), np.linspace(0, h, ny + 1)
+
+    @classmethod
+    def _static_key(cls, spec: GraphSpec) -> tuple | None:
+        if spec.axes is None and spec.grid is None:
+            return None
+        return (spec.size, spec.ticks, spec.axes, spec.grid)
+
+    @classmethod
+    def _draw_static(
+        cls, 
+        spec: GraphSpec, 
+        image: Image.Image,
+        ink: Callable, 
+        offset: tuple[int, int]
+    ) -> None:
+        draw = ImageDraw.Draw(image)
+        grid = spec.color('grid')
+        axes = spec.color('axes')
+        w, h = spec.size
+        x0, y0 = offset
+        cx, cy = w // 2, h // 2
+        xs, ys = map(np.floor, cls._ticks(spec))
+
+        if grid is not None:
+            for x in xs.tolist():
+                draw.line(((x - x0, -y0), (x - x0, h - y0)), fill=ink(grid), width=1)
+            for y in ys.tolist():
+                draw.line(((-x0, y - y0), (w - x0, y - y0)), fill=ink(grid), width=1)
+
+        if axes is not None:
+            draw.line(((cx - x0, -y0), (cx - x0, h - y0)), fill=ink(axes), width=1)
+            draw.line(((-x0, cy - y0), (w - x0, cy - y0)), fill=ink(axes), width=1)
+
+            for x in xs.tolist():
+                draw.line(((x - x0, cy - 2 - y0), (x - x0, cy + 2 - y0)), fill=ink(axes), width=1)
+            for y in ys.tolist():
+                draw.line(((cx - 2 - x0, y - y0), (cx + 2 - x0, y - y0)), fill=ink(axes), width=1)
+
+    @classmethod
+    def _draw_labels(
+        cls, 
+        spec: GraphSpec, 
+        image: Image.Image,
+        ink: Callable, 
+        offset: tuple[int, int]
+    ) -> None:
+        labels = spec.color('labels')
+        w, h = spec.size
+        cx, cy = w // 2, h // 2
+        xs, ys = cls._ticks(spec)
+
+        if labels is None:
+            return
+
+        text = {'font': spec.font, 'size': spec.fontsize, 'bounds': (w, h), 'offset': offset}
+        label_ink = ink(labels)
+        res_x, res_y = spec.res
+        values_x = np.linspace(-res_x, res_x, len(xs))
+        values_y = np.linspace(res_y, -res_y, len(ys))
 
+        for x, value in zip(xs.tolist(), values_x.tolist()):
+            paste_text(image, (x, cy + 4), format_tick(value), label_ink, anchor='ma', **text)
+        for y, value in zip(ys.tolist(), values_y.tolist()):
+            if round(value, 12):
+                paste_text(image, (cx + 4, y), format_tick(value), label_ink, anchor='lm', **text)
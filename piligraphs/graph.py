@@ -1,22 +1,649 @@
+import asyncio
+import math
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor
+import numpy as np
+from typing import Any, BinaryIO, Callable, Iterator, Literal, Sequence
+from pinkie import Color
 from PIL import Image
 
-
 from .node import Node
+from .palette import generate_color
+from .series import Source, SeriesIndex, iter_chunks, _lod
+from .spec import (
+    GraphSpec, 
+    NO_COLOR, 
+    pack_color, 
+    unpack_color, 
+    register_graph
+)
+
+
+Mode = Literal['RGBA', 'P', 'LA']
+
+# total size of cached static layers in bytes
+LAYER_CACHE_BYTES = 64 * 2**20
+
+_layers: OrderedDict[tuple, tuple[Image.Image, Callable]] = OrderedDict()
+_layers_bytes = 0
+_layers_lock = threading.Lock()
+
+
+def clear_layer_cache() -> None:
+    """Drop all cached static layers."""
+    global _layers_bytes
+    with _layers_lock:
+        _layers.clear()
+        _layers_bytes = 0
+
+
+def _image_bytes(image: Image.Image) -> int:
+    return image.width * image.height * len(image.getbands())
 
 
 class Graph:
+    # parameter replaced by `_resize`
+    _size_param = 'size'
+    # whether nodes are drawn with their own colors
+    _colored_nodes = False
+
+    def __init__(self) -> None:
+        self._mode: Mode | None = 'RGBA'
+        self._background: Color | None = None
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        register_graph(cls)
+
+    @property
+    def mode(self) -> Mode | None:
+        """
+        Image mode the graph is drawn in.
+        If `None`, the most compact mode for the graph colors is used.
+        """
+        return self._mode
+
+    @mode.setter
+    def mode(self, value: Mode | None):
+        if value not in {'RGBA', 'P', 'LA', None}:
+            raise ValueError(f"unsupported image mode: {value}")
+        self._mode = value
+
+    @property
+    def background(self) -> Color | None:
+        """
+        Background color. If `None`, the background is transparent.
+        Shapes replace the background pixels, translucent colors are not blended.
+        """
+        return self._background
+
+    @background.setter
+    def background(self, value: Color | int | str | tuple | None):
+        self._background = value if isinstance(value, Color) or value is None else Color(value)
+
+    @property
+    def colors(self) -> list[Color]:
+        """Colors the graph is drawn with."""
+        raise NotImplementedError()
+
+    def _auto_color(self, value: Color | None, *key: Any) -> Color | None:
+        """Pick a color left as `...` from the graph type and a key."""
+        return generate_color(type(self).__name__, *key) if value is ... else value
+
+    def _params(self) -> dict[str, Any]:
+        """Graph parameters stored in a spec. Colors are packed."""
+        return {'mode': self.mode, 'background': pack_color(self.background)}
+
+    def _data(self) -> tuple[np.ndarray | None, np.ndarray | None]:
+        """Node weights and packed colors stored in a spec."""
+        return None, None
+
+    def freeze(self) -> GraphSpec:
+        """
+        Take an immutable snapshot of the graph.
+        Later changes of the graph do not affect the snapshot.
+        """
+        return self._snapshot(*self._data())
+
+    def _snapshot(
+        self, 
+        weights: np.ndarray | None, 
+        colors: np.ndarray | None,
+        **params: Any
+    ) -> GraphSpec:
+        return GraphSpec(
+            type(self),
+            self._params() | params,
+            weights,
+            colors,
+            tuple(
+                pack_color(c) for c in dict.fromkeys((*self.colors, self.background))
+                if c is not None
+            )
+        )
+
+    def to_spec(self) -> bytes:
+        """Serialize the graph into a compact binary spec."""
+        return self.freeze().dumps()
+
+    @classmethod
+    def from_spec(cls, spec: GraphSpec | bytes) -> 'Graph':
+        """
+        Restore a graph from a spec.
+
+        Parameters
+        ----------
+        spec: `GraphSpec` | `bytes`
+            Spec or its serialized form.
+        """
+        if not isinstance(spec, GraphSpec):
+            spec = GraphSpec.loads(spec)
+        if not issubclass(spec.type, cls):
+            raise TypeError(
+                f"spec of '{spec.type.__name__}' cannot be loaded"
+                f" as '{cls.__name__}'"
+            )
+        
+        return spec.type._build(
+            spec.params, 
+            spec.weights.tolist(), 
+            spec.node_colors()
+        )
+
+    @classmethod
+    def _build(
+        cls, 
+        params: dict[str, Any], 
+        weights: Sequence[int | float], 
+        colors: Sequence[Any]
+    ) -> 'Graph':
+        """Create a graph from its parameters and node data."""
+        return cls(**params)
+
     def draw(self) -> Image.Image:
         """Draw the graph."""
-        raise NotImplementedError()
+        return self.freeze().draw()
+
+    def draw_sizes(
+        self, 
+        sizes: Sequence[Any], 
+        *, 
+        executor: Executor | None = None
+    ) -> list[Image.Image]:
+        """
+        Draw the graph at several sizes, e.g. a thumbnail and a retina export.
+        Every size is drawn from its own resized snapshot, the same way
+        as `draw`. Returns images in the order of sizes.
+
+        Parameters
+        ----------
+        sizes: `Sequence[Any]`
+            Values of the graph size parameter: `size` or `radius`.
+        executor: `Executor` | `None`
+            Executor to draw the sizes in.
+            If `None`, they are drawn one by one.
+        """
+        return self.freeze().draw_sizes(sizes, executor=executor)
+
+    @classmethod
+    def _image_size(cls, spec: GraphSpec) -> tuple[int, int]:
+        """Size of the image a snapshot is drawn into."""
+        return tuple(spec.size)
+
+    @classmethod
+    def _resize(cls, spec: GraphSpec, size: Any) -> GraphSpec:
+        """Copy of a snapshot drawn at another size. Node data is shared."""
+        return GraphSpec(
+            spec.type,
+            spec.params | {cls._size_param: size},
+            spec.weights,
+            spec.colors,
+            spec.palette
+        )
+
+    @classmethod
+    def _shape(cls, spec: GraphSpec) -> Any:
+        """
+        Compute the shapes of a snapshot independently of the image size,
+        e.g. in coordinates from 0 to 1. The result is passed to `_place`.
+        """
+        return None
+
+    @classmethod
+    def _place(cls, spec: GraphSpec, shape: Any) -> Any:
+        """Move the shapes of a snapshot into its image coordinates."""
+        return None
+
+    @classmethod
+    def _geometry(cls, spec: GraphSpec) -> Any:
+        """
+        Compute the shapes of a snapshot in image coordinates.
+        The result is passed to `_rasterize`.
+        """
+        return cls._place(spec, cls._shape(spec))
+
+    @classmethod
+    def _rasterize(
+        cls, 
+        spec: GraphSpec, 
+        geometry: Any, 
+        box: tuple[int, int, int, int]
+    ) -> Image.Image:
+        """
+        Draw the part of a snapshot within the box.
+        By default the whole image is drawn and cropped,
+        so graphs drawn in tiles should override it.
+        """
+        return cls._render(spec).crop(box)
+
+    @classmethod
+    def _render(cls, spec: GraphSpec) -> Image.Image:
+        """Draw a graph snapshot."""
+        return cls._rasterize(
+            spec, 
+            cls._geometry(spec), 
+            (0, 0, *cls._image_size(spec))
+        )
+
+    def draw_tiles(
+        self,
+        tile: tuple[int, int],
+        *,
+        executor: Executor | None = None,
+        prefetch: int = 4
+    ) -> Iterator[tuple[tuple[int, int, int, int], Image.Image]]:
+        """
+        Draw the graph tile by tile.
+        Shapes are computed once and clipped to every tile, so memory 
+        use depends on the tile size, not on the image size.
+        Graphs without their own `_rasterize` draw the whole image
+        for every tile instead, all built-in graphs have one.
+        Yields tile boxes and images row by row.
+
+        Tiles may differ from `draw` in a few pixels near their edges,
+        since Pillow rounds shapes crossing the tile origin differently.
+
+        Parameters
+        ----------
+        tile: `tuple[int, int]`
+            Tile width and height.
+        executor: `Executor` | `None`
+            Executor to draw tiles in parallel, e.g. a thread pool.
+            If `None`, tiles are drawn one by one when requested.
+        prefetch: `int`
+            Maximum number of tiles drawn ahead with an executor.
+        """
+        return self.freeze().draw_tiles(tile, executor=executor, prefetch=prefetch)
+
+    def save_tiled(
+        self,
+        fp: BinaryIO,
+        *,
+        strip: int = 256,
+        compress_level: int = 6,
+        executor: Executor | None = None
+    ) -> None:
+        """
+        Draw the graph into a PNG file strip by strip.
+        Every strip is compressed and written as soon as it is drawn,
+        so only a few strips are kept in memory.
+
+        Parameters
+        ----------
+        fp: `BinaryIO`
+            File-like object to write into.
+        strip: `int`
+            Strip height.
+        compress_level: `int`
+            Compression level from 0 to 9.
+        executor: `Executor` | `None`
+            Executor to draw strips in parallel.
+        """
+        self.freeze().save_tiled(
+            fp, 
+            strip=strip, 
+            compress_level=compress_level, 
+            executor=executor
+        )
+
+    async def draw_async(self, executor: Executor | None = None) -> Image.Image:
+        """
+        Draw the graph without blocking the event loop.
+        The graph is frozen before drawing, so it can be
+        changed while the drawing is in progress.
+
+        Parameters
+        ----------
+        executor: `Executor` | `None`
+            Executor to draw in. If `None`, the loop default executor is used.
+        """
+        spec = self.freeze()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, spec.draw)
+
+    @staticmethod
+    def _new_image(
+        spec: GraphSpec,
+        size: tuple[int, int]
+    ) -> tuple[Image.Image, Callable[[Color | None], int | tuple]]:
+        """
+        Create an empty image in the graph mode.
+        Returns the image and a function converting colors to its ink.
+        `None` color means transparent.
+        """
+        colors = [unpack_color(c) for c in spec.palette]
+        grayscale = all(c.r == c.g == c.b for c in colors)
+        mode = spec.mode
+
+        if mode is None:
+            mode = 'P' if len(colors) < 256 else 'RGBA'
+        elif mode == 'P' and len(colors) >= 256:
+            raise ValueError("too many colors for palette mode")
+        elif mode == 'LA' and not grayscale:
+            raise ValueError("LA mode requires grayscale colors")
+
+        if mode == 'P':
+            indices = {c: num for num, c in enumerate(colors, 1)}
+            ink = lambda c: 0 if c is None else indices[c]
+        elif mode == 'LA':
+            ink = lambda c: (0, 0) if c is None else (c.r, c.a)
+        else:
+            ink = lambda c: (0, 0, 0, 0) if c is None else c.rgba
+
+        image = Image.new(mode, size, ink(unpack_color(spec.params.get('background'))))
+
+        if mode == 'P':
+            image.putpalette(
+                bytes((0, 0, 0, 0)) + b''.join(bytes(c.rgba) for c in colors), 
+                'RGBA'
+            )
+
+        return image, ink
+
+    @classmethod
+    def _static_key(cls, spec: GraphSpec) -> tuple | None:
+        """
+        Parameters the static layer of the graph depends on,
+        like gridlines and axes. `None` if there is no static layer.
+        """
+        return None
+
+    @classmethod
+    def _draw_static(
+        cls, 
+        spec: GraphSpec, 
+        image: Image.Image, 
+        ink: Callable[[Color | None], int | tuple], 
+        offset: tuple[int, int]
+    ) -> None:
+        """Draw the static layer of the graph."""
+        pass
+
+    @classmethod
+    def _base_image(
+        cls,
+        spec: GraphSpec,
+        box: tuple[int, int, int, int]
+    ) -> tuple[Image.Image, Callable[[Color | None], int | tuple]]:
+        """
+        Create an image of a part of the graph with the static layer drawn.
+        Static layers of whole images are cached per process and copied, 
+        so redrawing a graph with new data only costs the data layer.
+        Tiles are drawn without the cache, they are rarely redrawn
+        and would fill it with parts of a single large image.
+        """
+        global _layers_bytes
+        x0, y0, x1, y1 = box
+        key = cls._static_key(spec)
+
+        if key is None:
+            return cls._new_image(spec, (x1 - x0, y1 - y0))
+
+        if box != (0, 0, *cls._image_size(spec)):
+            image, ink = cls._new_image(spec, (x1 - x0, y1 - y0))
+            cls._draw_static(spec, image, ink, (x0, y0))
+            return image, ink
+
+        key = (cls.__name__, key, spec.mode, spec.palette, spec.params.get('background'), box)
+
+        with _layers_lock:
+            layer = _layers.get(key)
+            if layer is not None:
+                _layers.move_to_end(key)
+
+        if layer is None:
+            layer = cls._new_image(spec, (x1 - x0, y1 - y0))
+            cls._draw_static(spec, *layer, (x0, y0))
+            size = _image_bytes(layer[0])
+
+            with _layers_lock:
+                if size <= LAYER_CACHE_BYTES and key not in _layers:
+                    _layers[key] = layer
+                    _layers_bytes += size
+                    while _layers_bytes > LAYER_CACHE_BYTES:
+                        _, (old, _) = _layers.popitem(last=False)
+                        _layers_bytes -= _image_bytes(old)
+
+        image, ink = layer
+        return image.copy(), ink
+
+    def render_bytes(
+        self,
+        format: str = 'PNG',
+        *,
+        quality: int | None = None,
+        fp: BinaryIO | None = None
+    ) -> bytes | None:
+        """
+        Draw the graph and encode it.
+
+        Charts are made of a few flat colors, so for palette formats
+        (PNG, GIF) the image is stored with an exact palette built
+        from the graph colors instead of full-depth RGBA.
+
+        Parameters
+        ----------
+        format: `str`
+            Image format, e.g. `PNG`, `WEBP`, `GIF` or `JPEG`.
+        quality: `int` | `None`
+            Encoding quality from 0 to 100. For lossy formats,
+            `None` means the encoder default (lossless for WebP).
+            For PNG, it sets the compression effort.
+        fp: `BinaryIO` | `None`
+            File-like object to write into.
+            If `None`, encoded bytes are returned.
+        """
+        return self.freeze().render_bytes(format, quality=quality, fp=fp)
+
+
+def _index_slice(viewport: tuple[float, float]) -> slice:
+    x0, x1 = viewport
+    return slice(max(math.ceil(x0), 0), max(math.floor(x1) + 1, 0))
+
+
+def _to_span(span: tuple[float, float]) -> tuple[float, float]:
+    # empty parts still get a range, labels need at least 2 points anyway
+    first, last = (float(v) for v in span)
+    return first, max(first, last)
 
 
 class NodeGraph(Graph):
     def __init__(self) -> None:
+        super().__init__()
         self._nodes: list[Node] = []
+        self._source: Source | None = None
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        for node in self._nodes:
+            node._attach(self)
 
     @property
     def nodes(self) -> list[Node]:
         return self._nodes
+
+    @property
+    def source(self) -> Source | None:
+        """
+        Weight source used instead of nodes, e.g. a NumPy memory map,
+        an iterable of chunks or a `SeriesIndex` for fast viewports. 
+        Huge series are reduced chunk by chunk to the minimums 
+        and maximums of the graph resolution.
+        One-shot iterators (like generators) can be drawn only once.
+        """
+        return self._source
+    
+    @source.setter
+    def source(self, value: Source | None):
+        self._source = value
+
+    def _resolution(self) -> int | None:
+        """Number of columns a source is reduced to. If `None`, it is not reduced."""
+        return None
+
+    @property
+    def colors(self) -> list[Color]:
+        return list(dict.fromkeys(
+            color for color in self.node_colors()
+            if color is not None
+        ))
+
+    def node_colors(self) -> list[Color | None]:
+        """
+        Colors of the nodes. Nodes with a color left as `...` 
+        get a color generated from the graph type and their index.
+        """
+        return [
+            self._auto_color(... if node.generated else node.color, 'node', i) 
+            for i, node in enumerate(self._nodes)
+        ]
+
+    @classmethod
+    def _build(
+        cls, 
+        params: dict[str, Any], 
+        weights: Sequence[int | float], 
+        colors: Sequence[Any]
+    ) -> 'NodeGraph':
+        # the visible range belongs to a snapshot, not to the graph
+        params = {k: v for k, v in params.items() if k != 'span'}
+        graph = cls(**params)
+        graph.add_nodes(*(
+            Node(weight=w, color=None if c == NO_COLOR else c) 
+            for w, c in zip(weights, colors, strict=True)
+        ))
+        return graph
+
+    def freeze(self, viewport: tuple[float, float] | None = None) -> GraphSpec:
+        """
+        Take an immutable snapshot of the graph.
+        Later changes of the graph do not affect the snapshot.
+
+        Parameters
+        ----------
+        viewport: `tuple[float, float]` | `None`
+            Start and end of the visible part of the series, inclusive.
+            These are x values for a `SeriesIndex` source with x values, 
+            and node indices otherwise. If `None`, all nodes are visible.
+            The first and last x values of the visible part are stored
+            in the `span` parameter of the snapshot.
+        """
+        weights, colors, span = self._data(viewport)
+        return self._snapshot(weights, colors, span=span)
+
+    def draw(self, viewport: tuple[float, float] | None = None) -> Image.Image:
+        """
+        Draw the graph.
+
+        Parameters
+        ----------
+        viewport: `tuple[float, float]` | `None`
+            Visible part of the series. See `freeze` for details.
+        """
+        return self.freeze(viewport).draw()
+
+    def draw_sizes(
+        self, 
+        sizes: Sequence[Any], 
+        *, 
+        viewport: tuple[float, float] | None = None,
+        executor: Executor | None = None
+    ) -> list[Image.Image]:
+        """
+        Draw the graph at several sizes.
+        See `Graph.draw_sizes` for details. Series sources 
+        are reduced to the resolution of the graph itself.
+
+        Parameters
+        ----------
+        sizes: `Sequence[Any]`
+            Values of the graph size parameter: `size` or `radius`.
+        viewport: `tuple[float, float]` | `None`
+            Visible part of the series. See `freeze` for details.
+        executor: `Executor` | `None`
+            Executor to draw the sizes in.
+        """
+        return self.freeze(viewport).draw_sizes(sizes, executor=executor)
+
+    def _data(
+        self, 
+        viewport: tuple[float, float] | None = None
+    ) -> tuple[np.ndarray, np.ndarray, tuple[float, float]]:
+        """Node weights, packed colors and the first and last visible x values."""
+        source = self._source
+        if source is not None:
+            num = self._resolution()
+
+            if isinstance(source, SeriesIndex):
+                start, end = (0, len(source)) if viewport is None else source.range(*viewport)
+                if num is None:
+                    weights = np.array(source.weights[start:end], dtype=np.float64)
+                else:
+                    weights = source.query(num, viewport)
+
+                if source.x is None:
+                    span = (start, end - 1)
+                elif viewport is not None:
+                    span = viewport
+                else:
+                    span = (source.x[0], source.x[-1]) if len(source) else (0, 0)
+            else:
+                offset = 0
+                if viewport is not None:
+                    if not isinstance(source, np.ndarray):
+                        raise TypeError("viewport requires an array or SeriesIndex source")
+                    visible = range(source.size)[_index_slice(viewport)]
+                    source = source.ravel()[visible.start:visible.stop]
+                    offset = visible.start
+                
+                if num is None:
+                    weights = np.concatenate(
+                        [np.empty(0), *iter_chunks(source)], 
+                        dtype=np.float64
+                    )
+                    total = len(weights)
+                else:
+                    weights, total = _lod(source, num)
+
+                span = (offset, offset + total - 1)
+            
+            colors = np.full(len(weights), NO_COLOR, dtype=np.int64)
+            return weights, colors, _to_span(span)
+
+        nodes = self._nodes
+        node_colors = self.node_colors()
+        visible = range(len(nodes))
+        if viewport is not None:
+            visible = visible[_index_slice(viewport)]
+            nodes = nodes[visible.start:visible.stop]
+            node_colors = node_colors[visible.start:visible.stop]
+        weights = np.array([node.weight for node in nodes], dtype=np.float64)
+        colors = np.array(
+            [NO_COLOR if color is None else int(color) for color in node_colors], 
+            dtype=np.int64
+        )
+        return weights, colors, _to_span((visible.start, visible.stop - 1))
         
     def add_nodes(self, *nodes: Node) -> None:
         """
@@ -35,6 +662,7 @@ class NodeGraph(Graph):
                 )
             
             self._nodes.append(node)
+            node._attach(self)
 
     def remove_nodes(self, *nodes: Node) -> None:
         """
@@ -1,8 +1,14 @@
+import math
+import numpy as np
+from typing import Any, Callable, Literal
 from pinkie import Color
 from PIL import Image, ImageDraw
+from scipy.interpolate import interp1d
 
-from .graph import NodeGraph
-from .utils import limit, interpolate, Interpolation
+from .graph import NodeGraph, Mode
+from .spec import GraphSpec, pack_color
+from .text import format_tick, paste_text
+from .utils import clip_points, to_boxes, to_points, Interpolation
 
 
 class LineChart(NodeGraph):
@@ -17,9 +23,18 @@ class LineChart(NodeGraph):
         outline: Color | int | str | tuple[int, int, int] | tuple[int, int, int, int] | None = ...,
         pwidth: int = 0,
         onlysrc: bool = False,
-        npoints: int | None = None,
+        npoints: int | Literal['auto'] | None = None,
         interp: Interpolation = 'linear',
-        minh: int = 0
+        minh: int = 0,
+        layers: int = 1,
+        axes: Color | int | str | tuple[int, int, int] | tuple[int, int, int, int] | None = None,
+        grid: Color | int | str | tuple[int, int, int] | tuple[int, int, int, int] | None = None,
+        labels: Color | int | str | tuple[int, int, int] | tuple[int, int, int, int] | None = None,
+        ticks: tuple[int, int] = (5, 4),
+        font: str | None = None,
+        fontsize: int = 10,
+        background: Color | int | str | tuple[int, int, int] | tuple[int, int, int, int] | None = None,
+        mode: Mode | None = 'RGBA'
     ) -> None:
         """
         Parameters
@@ -29,19 +44,42 @@ class LineChart(NodeGraph):
         thickness: `int`
             Line thickness.
         fill: `Color` | `None`
-            Fill color. If = `...`, generates a random color.
+            Fill color. If = `...`, a color is generated from the graph type.
         outline: `Color` | `None`
-            Line color. If = `...`, generates a random color.
+            Line color. If = `...`, a color is generated from the graph type.
         pwidth: `int`
             Point width.
         onlysrc: `bool`
             To draw bold dots only in source points (without interpolated ones).
-        npoints: `int`
-            Number of points. If <= 0, equals to the number of nodes.
+        npoints: `int` | `str` | `None`
+            Number of points. If `None` or <= 0, equals to the number of nodes.
+            If `auto`, curves get a point per pixel column.
         interp: `str`
             Kind of interpolation. Used to make a smooth curve.
         minh: `int`
             Minimum height from the bottom of the graph.
+        layers: `int`
+            Number of stacked series. If > 1, every `layers` consecutive 
+            nodes make one point of a stacked area chart, from the bottom 
+            layer to the top one. Layers are filled with the colors 
+            of the first `layers` nodes, or `fill` if a node has no color.
+        axes: `Color` | `None`
+            Color of the axes and tick marks. If `None`, no axes will be drawn.
+        grid: `Color` | `None`
+            Gridline color. If `None`, no grid will be drawn.
+        labels: `Color` | `None`
+            Tick label color. If `None`, no labels will be drawn.
+        ticks: `tuple[int, int]`
+            Numbers of divisions along x and y.
+        font: `str` | `None`
+            Label font path or name. If `None`, the default font is used.
+        fontsize: `int`
+            Label font size.
+        background: `Color` | `None`
+            Background color. If `None`, the background is transparent.
+        mode: `str` | `None`
+            Image mode: `RGBA`, `P` or `LA`.
+            If `None`, the most compact mode for the graph colors is used.
         """
         super().__init__()
 
@@ -54,6 +92,15 @@ class LineChart(NodeGraph):
         self.npoints = npoints
         self.interp = interp
         self.minh = minh
+        self.layers = layers
+        self.axes = axes
+        self.grid = grid
+        self.labels = labels
+        self.ticks = ticks
+        self.font = font
+        self.fontsize = fontsize
+        self.background = background
+        self.mode = mode
 
     @property
     def size(self) -> tuple[int, int]:
@@ -78,28 +125,24 @@ class LineChart(NodeGraph):
     @property
     def fill(self) -> Color | None:
         """Shape color. If `None`, no shape will be drawn."""
-        return self._fill
+        return self._auto_color(self._fill, 'fill')
     
     @fill.setter
     def fill(self, value: Color | int | str | tuple | None):
-        if isinstance(value, Color) or value is None:
+        if isinstance(value, Color) or value is None or value is ...:
             self._fill = value
-        elif value is ...:
-            self._fill = Color.random()
         else:
             self._fill = Color(value)
 
     @property
     def outline(self) -> Color | None:
         """Line color. If `None`, no line will be drawn."""
-        return self._outline
+        return self._auto_color(self._outline, 'outline')
     
     @outline.setter
     def outline(self, value: Color | int | str | tuple | None):
-        if isinstance(value, Color) or value is None:
+        if isinstance(value, Color) or value is None or value is ...:
             self._outline = value
-        elif value is ...:
-            self._outline = Color.random()
         else:
             self._outline = Color(value)
 
@@ -122,12 +165,14 @@ class LineChart(NodeGraph):
         self._onlysrc = value
       
     @property
-    def npoints(self) -> int | None:
+    def npoints(self) -> int | Literal['auto'] | None:
         """Number of points."""
         return self._npoints
     
     @npoints.setter
-    def npoints(self, value: int | None):
+    def npoints(self, value: int | Literal['auto'] | None):
+        if isinstance(value, str) and value != 'auto':
+            raise ValueError(f"unsupported number of points: {value}")
         self._npoints = value
        
     @property
@@ -148,66 +193,390 @@ class LineChart(NodeGraph):
     def minh(self, value: int):
         self._minh = value
 
-    def draw(self) -> Image.Image:
-        image = Image.new('RGBA', self.size)
-        num_nodes = len(self.nodes)
+    @property
+    def layers(self) -> int:
+        """Number of stacked series."""
+        return self._layers
+    
+    @layers.setter
+    def layers(self, value: int):
+        if value < 1:
+            raise ValueError("layers should be positive")
+        self._layers = value
+
+    @property
+    def axes(self) -> Color | None:
+        """Axis color. If `None`, no axes will be drawn."""
+        return self._axes
+    
+    @axes.setter
+    def axes(self, value: Color | int | str | tuple | None):
+        self._axes = value if isinstance(value, Color) or value is None else Color(value)
+
+    @property
+    def grid(self) -> Color | None:
+        """Gridline color. If `None`, no grid will be drawn."""
+        return self._grid
+    
+    @grid.setter
+    def grid(self, value: Color | int | str | tuple | None):
+        self._grid = value if isinstance(value, Color) or value is None else Color(value)
+
+    @property
+    def labels(self) -> Color | None:
+        """Tick label color. If `None`, no labels will be drawn."""
+        return self._labels
+    
+    @labels.setter
+    def labels(self, value: Color | int | str | tuple | None):
+        self._labels = value if isinstance(value, Color) or value is None else Color(value)
+
+    @property
+    def ticks(self) -> tuple[int, int]:
+        """Numbers of divisions along x and y."""
+        return self._ticks
+    
+    @ticks.setter
+    def ticks(self, value: tuple[int, int]):
+        if len(value) != 2:
+            raise ValueError("ticks should contain 2 items")
+        self._ticks = value
+
+    @property
+    def font(self) -> str | None:
+        """Label font path or name."""
+        return self._font
+    
+    @font.setter
+    def font(self, value: str | None):
+        self._font = value
 
-        if num_nodes in {0, 1}:
-            return image
+    @property
+    def fontsize(self) -> int:
+        """Label font size."""
+        return self._fontsize
+    
+    @fontsize.setter
+    def fontsize(self, value: int):
+        self._fontsize = value
+
+    @property
+    def colors(self) -> list[Color]:
+        colors = [self.fill, self.outline, self.axes, self.grid, self.labels]
+        if self.layers > 1:
+            colors.extend(self.node_colors()[:self.layers])
+        return list(dict.fromkeys(c for c in colors if c is not None))
+
+    def _resolution(self) -> int | None:
+        if self.layers > 1:
+            # reduced series would mix the points of different layers
+            return None
+        return max(int(self.size[0]), 1)
+
+    def _params(self) -> dict[str, Any]:
+        return super()._params() | {
+            'size': tuple(self.size),
+            'thickness': self.thickness,
+            'fill': pack_color(self.fill),
+            'outline': pack_color(self.outline),
+            'pwidth': self.pwidth,
+            'onlysrc': self.onlysrc,
+            'npoints': self.npoints,
+            'interp': self.interp,
+            'minh': self.minh,
+            'layers': self.layers,
+            'axes': pack_color(self.axes),
+            'grid': pack_color(self.grid),
+            'labels': pack_color(self.labels),
+            'ticks': tuple(self.ticks),
+            'font': self.font,
+            'fontsize': self.fontsize
+        }
+
+    @classmethod
+    def _stacks(cls, spec: GraphSpec) -> np.ndarray:
+        """Cumulative tops of the layers with shape `(points, layers)`."""
+        layers = spec.layers
+        weights = np.zeros(-(-len(spec.weights) // layers) * layers)
+        weights[:len(spec.weights)] = spec.weights
+        return np.cumsum(weights.reshape(-1, layers), axis=1)
+
+    @staticmethod
+    def _num_points(spec: GraphSpec, num_nodes: int) -> int:
+        """Number of interpolated points of a curve."""
+        if spec.npoints != 'auto':
+            return spec.npoints or num_nodes
         
+        # straight segments need only the nodes
+        if spec.interp in {'linear', 'slinear'}:
+            return num_nodes
+
+        # about a point per pixel column, with every node among the points
+        radius = spec.pwidth / 2 if spec.pwidth > 0 else spec.thickness / 2
+        columns = spec.size[0] - 2 * radius
+        return max(math.ceil(columns / (num_nodes - 1)), 1) * (num_nodes - 1) + 1
+
+    @classmethod
+    def _shape(cls, spec: GraphSpec) -> dict[str, Any] | None:
+        if spec.layers > 1:
+            # all layers and the zero baseline share one scale
+            tops = cls._stacks(spec)
+            levels = np.column_stack((np.zeros(len(tops)), tops))
+        else:
+            levels = spec.weights[:, None]
+
+        num_points = len(levels)
+
+        if num_points in {0, 1}:
+            return None
+
+        num = cls._num_points(spec, num_points)
+        max_weight = levels.max()
+        values = max_weight - levels
+        vmin, vmax = values.min(), values.max()
+
+        # x from 0 to 1, y from 0 (the top) to 1 (the bottom)
+        xs = np.linspace(0, 1, num_points)
+        ys = values if vmax == vmin else (values - vmin) / (vmax - vmin)
+
+        if num == num_points and spec.interp == 'linear':
+            # a linear curve through the nodes only is the nodes
+            smooth_x, smooth_y = xs, ys
+        else:
+            # every layer is interpolated in one call
+            smooth_x = np.linspace(0, 1, num)
+            smooth_y = interp1d(xs, ys, kind=spec.interp, axis=0)(smooth_x)
+            smooth_y = np.clip(smooth_y, ys.min(), ys.max())
+        # keep the layers from crossing after interpolation overshoots
+        smooth_y = np.minimum.accumulate(smooth_y, axis=1)
+
+        return {
+            'source': (xs, ys),
+            'smooth': (smooth_x, smooth_y),
+            'zero': max_weight == 0,
+            'flat': vmax == vmin
+        }
+
+    @classmethod
+    def _place(
+        cls, 
+        spec: GraphSpec, 
+        shape: dict[str, Any] | None
+    ) -> dict[str, np.ndarray] | None:
+        if shape is None:
+            return None
+
+        w, h = spec.size
+        radius = spec.pwidth / 2 if spec.pwidth > 0 else spec.thickness / 2
+        bottom = h - radius - spec.minh
+
+        def to_image(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+            # points with shape (layers, points, 2), the baseline is dropped
+            ys = ys.T[-spec.layers:]
+            points = np.empty((*ys.shape, 2))
+            points[..., 0] = radius + xs * (w - 2 * radius)
+            if shape['zero']:
+                points[..., 1] = h - radius
+            elif shape['flat']:
+                points[..., 1] = ys
+            else:
+                points[..., 1] = radius + ys * (bottom - radius)
+            return points
+
+        smooth_p = to_image(*shape['smooth'])
+
+        if spec.pwidth and not spec.onlysrc:
+            bald_p = smooth_p
+        else:
+            source_p = to_image(*shape['source'])
+            bald_p = source_p if spec.pwidth else source_p[:, [0, -1]]
+
+        if spec.layers > 1:
+            return {'layers': smooth_p, 'points': bald_p}
+        return {'smooth': smooth_p[0], 'points': bald_p[0]}
+
+    @classmethod
+    def _rasterize(
+        cls, 
+        spec: GraphSpec, 
+        geometry: dict[str, np.ndarray] | None, 
+        box: tuple[int, int, int, int]
+    ) -> Image.Image:
+        image, ink = cls._base_image(spec, box)
         draw = ImageDraw.Draw(image)
 
-        w, h = self.size
-        thickness = self.thickness
-        num = self.npoints or num_nodes
-        max_weight = max((i.weight for i in self.nodes))
-        radius = self.pwidth / 2 if self.pwidth > 0 else thickness / 2
+        if geometry is not None and 'layers' in geometry:
+            cls._draw_layers(spec, geometry, draw, ink, box)
+        elif geometry is not None:
+            cls._draw_data(spec, geometry, draw, ink, box)
+
+        cls._draw_labels(spec, image, ink, box[:2])
 
-        lim_xs = limit(
-            [w / (num_nodes - 1) * i for i in range(num_nodes)], 
-            radius, 
-            w - radius
+        return image
+
+    @staticmethod
+    def _ticks(spec: GraphSpec) -> tuple[np.ndarray, np.ndarray]:
+        w, h = spec.size
+        nx, ny = spec.ticks
+        radius = spec.pwidth / 2 if spec.pwidth > 0 else spec.thickness / 2
+        return (
+            np.linspace(radius, w - radius, nx + 1),
+            np.linspace(radius, h - radius - spec.minh, ny + 1)
         )
 
-        if max_weight == 0:
-            lim_ys = [h - radius] * num_nodes
-        else:
-            lim_ys = limit(
-                [max_weight - node.weight for node in self.nodes], 
-                radius, 
-                h - radius - self.minh
-            )
-        
-        source_p = list(zip(lim_xs, lim_ys))
-        smooth_p = interpolate(source_p, num, kind=self.interp)
+    @classmethod
+    def _static_key(cls, spec: GraphSpec) -> tuple | None:
+        if spec.axes is None and spec.grid is None:
+            return None
+        return (
+            spec.size, spec.ticks, spec.thickness, spec.pwidth, 
+            spec.minh, spec.axes, spec.grid
+        )
+
+    @classmethod
+    def _draw_static(
+        cls, 
+        spec: GraphSpec, 
+        image: Image.Image,
+        ink: Callable, 
+        offset: tuple[int, int]
+    ) -> None:
+        draw = ImageDraw.Draw(image)
+        grid = spec.color('grid')
+        axes = spec.color('axes')
+        w, h = spec.size
+        x0, y0 = offset
+        xs, ys = map(np.floor, cls._ticks(spec))
 
-        if self.fill:
+        if grid is not None:
+            for x in xs.tolist():
+                draw.line(((x - x0, -y0), (x - x0, h - y0)), fill=ink(grid), width=1)
+            for y in ys.tolist():
+                draw.line(((-x0, y - y0), (w - x0, y - y0)), fill=ink(grid), width=1)
+
+        if axes is not None:
+            draw.line(((-x0, -y0), (-x0, h - y0)), fill=ink(axes), width=1)
+            draw.line(((-x0, h - 1 - y0), (w - x0, h - 1 - y0)), fill=ink(axes), width=1)
+
+            for x in xs.tolist():
+                draw.line(((x - x0, h - 5 - y0), (x - x0, h - y0)), fill=ink(axes), width=1)
+            for y in ys.tolist():
+                draw.line(((-x0, y - y0), (4 - x0, y - y0)), fill=ink(axes), width=1)
+
+    @classmethod
+    def _draw_labels(
+        cls, 
+        spec: GraphSpec, 
+        image: Image.Image,
+        ink: Callable, 
+        offset: tuple[int, int]
+    ) -> None:
+        labels = spec.color('labels')
+        if labels is None:
+            return
+
+        tops = cls._stacks(spec)
+        if len(tops) < 2:
+            return
+
+        w, h = spec.size
+        xs, ys = cls._ticks(spec)
+        text = {'font': spec.font, 'size': spec.fontsize, 'bounds': (w, h), 'offset': offset}
+        label_ink = ink(labels)
+        # x values of the visible data, every point of layered charts
+        # is made of `layers` consecutive nodes
+        first, last = spec.params.get('span', (0, len(spec.weights) - 1))
+        if spec.layers > 1:
+            first, last = first / spec.layers, (last + 1) / spec.layers - 1
+        index = np.linspace(first, last, len(xs))
+        values = np.linspace(
+            tops.max(), 
+            0 if spec.layers > 1 else tops.min(), 
+            len(ys)
+        )
+
+        for x, value in zip(xs.tolist(), index.tolist()):
+            paste_text(image, (x, h - 6), format_tick(value), label_ink, anchor='md', **text)
+        for y, value in zip(ys.tolist(), values.tolist()):
+            paste_text(image, (6, y), format_tick(value), label_ink, anchor='lm', **text)
+
+    @classmethod
+    def _draw_data(
+        cls, 
+        spec: GraphSpec, 
+        geometry: dict[str, np.ndarray],
+        draw: ImageDraw.ImageDraw, 
+        ink: Callable, 
+        box: tuple[int, int, int, int]
+    ) -> None:
+        x0, y0, x1, y1 = box
+        h = spec.size[1]
+        fill = spec.color('fill')
+        outline = spec.color('outline')
+        thickness = spec.thickness
+        radius = spec.pwidth / 2 if spec.pwidth > 0 else thickness / 2
+        margin = thickness + radius
+        offset = (x0, y0)
+        smooth_p = to_points(
+            clip_points(geometry['smooth'], x0 - margin, x1 + margin), 
+            offset
+        )
+
+        if fill:
             draw.polygon(
-                [(radius, h)] + smooth_p + [(w - radius, h)],
-                fill=self.fill.rgba, 
+                [(smooth_p[0][0], h - y0)] + smooth_p + [(smooth_p[-1][0], h - y0)],
+                fill=ink(fill), 
                 width=0
             )
 
-        if self.outline:
+        if outline:
             draw.line(
                 smooth_p, 
-                fill=self.outline.rgba, 
+                fill=ink(outline), 
                 width=thickness, 
                 joint='curve'
             )
 
-            bald_p = (source_p[0], source_p[num_nodes-1])
-            if self.pwidth:
-                bald_p = source_p if self.onlysrc else smooth_p
+            bald_p = clip_points(geometry['points'], x0 - margin, x1 + margin)
 
-            for x, y in bald_p:
-                draw.ellipse(
-                    (
-                        (x - radius, y - radius),
-                        (x + radius, y + radius)
-                    ),
-                    fill=self.outline.rgba, 
-                    width=0
-                )
+            for box in to_boxes(bald_p, radius, offset):
+                draw.ellipse(box, fill=ink(outline), width=0)
 
-        return image
+    @classmethod
+    def _draw_layers(
+        cls, 
+        spec: GraphSpec, 
+        geometry: dict[str, np.ndarray],
+        draw: ImageDraw.ImageDraw, 
+        ink: Callable, 
+        box: tuple[int, int, int, int]
+    ) -> None:
+        x0, y0, x1, y1 = box
+        h = spec.size[1]
+        fill = spec.color('fill')
+        outline = spec.color('outline')
+        thickness = spec.thickness
+        radius = spec.pwidth / 2 if spec.pwidth > 0 else thickness / 2
+        margin = thickness + radius
+        offset = (x0, y0)
+        node_colors = (spec.node_colors() + [None] * spec.layers)[:spec.layers]
+        tops = [
+            to_points(clip_points(layer, x0 - margin, x1 + margin), offset)
+            for layer in geometry['layers']
+        ]
+        lower = [(tops[0][-1][0], h - y0), (tops[0][0][0], h - y0)]
+
+        # every band is filled only between its own top and the top below
+        for top, color in zip(tops, node_colors):
+            color = fill if color is None else color
+            if color:
+                draw.polygon(top + lower, fill=ink(color), width=0)
+            lower = top[::-1]
+
+        if outline:
+            for top, points in zip(tops, geometry['points']):
+                draw.line(top, fill=ink(outline), width=thickness, joint='curve')
+
+                points = clip_points(points, x0 - margin, x1 + margin)
+                for box in to_boxes(points, radius, offset):
+                    draw.ellipse(box, fill=ink(outline), width=0)
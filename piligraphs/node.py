@@ -1,5 +1,11 @@
+import weakref
+from typing import TYPE_CHECKING
 from pinkie import Color
 
+from .palette import generate_color
+if TYPE_CHECKING:
+    from .graph import NodeGraph
+
 
 class Node:
     """Class representing a graph node."""
@@ -10,6 +16,7 @@ class Node:
         weight: int | float = 1,
         color: Color | int | str | tuple[int, int, int] | tuple[int, int, int, int] | None = ...
     ) -> None:
+        self._graph = None
         self.weight = weight
         self.color = color
 
@@ -24,14 +31,37 @@ class Node:
   
     @property
     def color(self) -> Color | None:
-        """Node color."""
-        return self._color
+        """
+        Node color. If it was left as `...`, it is the color generated 
+        by the graph the node was last added to, from the graph type 
+        and the node index, the same color the node is drawn with.
+        """
+        if self._color is not ...:
+            return self._color
+
+        graph = self._graph() if self._graph is not None else None
+        if graph is not None:
+            for node, color in zip(graph.nodes, graph.node_colors()):
+                if node is self:
+                    return color
+
+        return generate_color(type(self).__name__)
     
     @color.setter
     def color(self, value: Color | int | str | tuple | None):
-        if isinstance(value, Color) or value is None:
+        if isinstance(value, Color) or value is None or value is ...:
             self._color = value
-        elif value is ...:
-            self._color = Color.random()
         else:
-            self._color = Color(value)
\ No newline at end of file
+            self._color = Color(value)
+
+    @property
+    def generated(self) -> bool:
+        """Whether the color is generated by the graph."""
+        return self._color is ...
+
+    def _attach(self, graph: 'NodeGraph') -> None:
+        self._graph = weakref.ref(graph)
+
+    def __getstate__(self) -> dict:
+        # graphs attach their nodes again when they are restored
+        return self.__dict__ | {'_graph': None}
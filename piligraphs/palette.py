@@ -0,0 +1,85 @@
+import hashlib
+from functools import lru_cache
+from typing import Any
+from pinkie import Color
+
+
+class ColorGenerator:
+    """
+    Seedable generator of colors.
+
+    A color depends only on the seed and its key, e.g. the graph type
+    and a node index, so the same graph gets the same colors every time
+    it is built, and its images can be cached.
+    """
+
+    def __init__(self, seed: int = 0) -> None:
+        """
+        Parameters
+        ----------
+        seed: `int`
+            Seed of the colors.
+        """
+        self.seed = seed
+
+    @property
+    def seed(self) -> int:
+        """Seed of the colors."""
+        return self._seed
+
+    @seed.setter
+    def seed(self, value: int):
+        self._seed = int(value)
+
+    def color(self, key: Any) -> Color:
+        """
+        Get the color of a key.
+
+        Parameters
+        ----------
+        key: `Any`
+            Color key: a string, an integer, bytes (e.g. a data hash)
+            or a tuple of them.
+        """
+        if not isinstance(key, tuple):
+            key = (key,)
+        return Color(_packed_color(self.seed, key))
+
+
+@lru_cache(maxsize=4096)
+def _packed_color(seed: int, key: tuple) -> int:
+    data = b'\x1f'.join(
+        k if isinstance(k, bytes) else str(k).encode()
+        for k in key
+    )
+    digest = hashlib.blake2b(data, digest_size=4, key=str(seed).encode()).digest()
+    return int.from_bytes(digest, 'big')
+
+
+_colors = ColorGenerator()
+
+
+def seed_colors(seed: int) -> None:
+    """
+    Set the process-wide seed of colors left as `...`.
+    Such colors are picked when a graph is frozen or drawn,
+    so the seed affects graphs that already exist too.
+
+    Parameters
+    ----------
+    seed: `int`
+        Seed of the colors.
+    """
+    _colors.seed = seed
+
+
+def generate_color(*key: Any) -> Color:
+    """
+    Get the color of a key with the process-wide seed.
+
+    Parameters
+    ----------
+    key: `Any`
+        Parts of the color key, e.g. a graph type name and a node index.
+    """
+    return _colors.color(key)
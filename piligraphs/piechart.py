@@ -1,12 +1,20 @@
+import numpy as np
+from typing import Any, Callable
+from pinkie import Color
 from PIL import Image, ImageDraw
 
-from .graph import NodeGraph
-from .utils import circle_xy, limit
+from .graph import NodeGraph, Mode
+from .spec import GraphSpec, pack_color
+from .text import paste_text
+from .utils import circle_xy, limit, to_boxes, to_points
 
 
 class PieChart(NodeGraph):
     """Class representing a pie chart."""
 
+    _size_param = 'radius'
+    _colored_nodes = True
+
     def __init__(
         self,
         radius: int,
@@ -14,7 +22,12 @@ class PieChart(NodeGraph):
         thickness: int | None = None,
         angle: int | float = 0,
         emboss: int = 0,
-        gap: int = 0
+        gap: int = 0,
+        labels: Color | int | str | tuple[int, int, int] | tuple[int, int, int, int] | None = None,
+        font: str | None = None,
+        fontsize: int = 10,
+        background: Color | int | str | tuple[int, int, int] | tuple[int, int, int, int] | None = None,
+        mode: Mode | None = 'RGBA'
     ) -> None:
         """
         Parameters
@@ -31,6 +44,17 @@ class PieChart(NodeGraph):
             If < 0, slice size inverts (bigger value = smaller radius).
         gap: `int`
             Space between the pie slices.
+        labels: `Color` | `None`
+            Color of the slice share labels. If `None`, no labels will be drawn.
+        font: `str` | `None`
+            Label font path or name. If `None`, the default font is used.
+        fontsize: `int`
+            Label font size.
+        background: `Color` | `None`
+            Background color. If `None`, the background is transparent.
+        mode: `str` | `None`
+            Image mode: `RGBA`, `P` or `LA`.
+            If `None`, the most compact mode for the graph colors is used.
         """
         super().__init__()
 
@@ -39,6 +63,11 @@ class PieChart(NodeGraph):
         self.angle = angle
         self.emboss = emboss
         self.gap = gap
+        self.labels = labels
+        self.font = font
+        self.fontsize = fontsize
+        self.background = background
+        self.mode = mode
 
     @property
     def radius(self) -> int:
@@ -85,24 +114,83 @@ class PieChart(NodeGraph):
     def gap(self, value: int):
         self._gap = value
 
-    def draw(self) -> Image.Image:
-        radius = self.radius
+    @property
+    def labels(self) -> Color | None:
+        """Slice label color. If `None`, no labels will be drawn."""
+        return self._labels
+    
+    @labels.setter
+    def labels(self, value: Color | int | str | tuple | None):
+        self._labels = value if isinstance(value, Color) or value is None else Color(value)
+
+    @property
+    def font(self) -> str | None:
+        """Label font path or name."""
+        return self._font
+    
+    @font.setter
+    def font(self, value: str | None):
+        self._font = value
+
+    @property
+    def fontsize(self) -> int:
+        """Label font size."""
+        return self._fontsize
+    
+    @fontsize.setter
+    def fontsize(self, value: int):
+        self._fontsize = value
+
+    @property
+    def colors(self) -> list[Color]:
+        colors = super().colors
+        if self.labels is not None and self.labels not in colors:
+            colors.append(self.labels)
+        return colors
+
+    def _params(self) -> dict[str, Any]:
+        return super()._params() | {
+            'radius': self.radius,
+            'thickness': self.thickness,
+            'angle': self.angle,
+            'emboss': self.emboss,
+            'gap': self.gap,
+            'labels': pack_color(self.labels),
+            'font': self.font,
+            'fontsize': self.fontsize
+        }
+
+    @classmethod
+    def _image_size(cls, spec: GraphSpec) -> tuple[int, int]:
+        return (spec.radius * 2, spec.radius * 2)
+
+    @classmethod
+    def _rasterize(
+        cls, 
+        spec: GraphSpec, 
+        geometry: None, 
+        box: tuple[int, int, int, int]
+    ) -> Image.Image:
+        x0, y0, x1, y1 = box
+        origin = (x0, y0)
+        radius = spec.radius
         w = radius * 2
-        image = Image.new('RGBA', (w, w))
-        num_nodes = len(self.nodes)
+        image, ink = cls._base_image(spec, box)
+        weights = spec.weights
+        num_nodes = len(weights)
 
         if num_nodes == 0:
             return image
         
         draw = ImageDraw.Draw(image)
 
-        weights = [node.weight for node in self.nodes]
-        total_weight = sum(weights)
-        start_angle = self.angle
-        emboss = self.emboss
-        gap = self.gap
-        clear_co = (0, 0, 0, 0)
+        total_weight = weights.sum()
+        start_angle = spec.angle
+        emboss = spec.emboss
+        gap = spec.gap
+        clear_co = ink(spec.color('background'))
         eq_angle = 360 / num_nodes
+        center = (radius, radius)
 
         offsets = limit(
             weights, 
@@ -110,43 +198,37 @@ class PieChart(NodeGraph):
             min(emboss, 0)
         )
 
-        for num, node in enumerate(self.nodes):
+        for num, color in enumerate(spec.node_colors()):
             offset = offsets[num]
             angle = (
                 eq_angle 
                 if total_weight == 0 else 
-                360 / total_weight * node.weight 
+                360 / total_weight * weights[num] 
             )
             end_angle = start_angle + angle
 
-            if node.color is not None:
+            if color is not None:
                 draw.pieslice(
-                    (
-                        (offset, offset), 
-                        (w - offset, w - offset)
-                    ),
+                    to_points(np.array(((offset, offset), (w - offset, w - offset))), origin),
                     start_angle, 
                     end_angle,
-                    fill=node.color.rgba,
+                    fill=ink(color),
                     width=0
                 )
                 
                 if gap > 0 and num:
                     draw.line(
-                        (
-                            (radius, radius), 
-                            circle_xy(radius, radius, start_angle)
-                        ),
+                        to_points(np.array((center, circle_xy(radius, radius, start_angle))), origin),
                         fill=clear_co, 
                         width=gap
                     )
                 
-                if self.thickness > 0:
-                    l_space = self.thickness - offset
+                if spec.thickness:
+                    l_space = spec.thickness - offset
                     r_space = w - l_space
 
                     draw.pieslice(
-                        ((l_space, l_space), (r_space, r_space)),
+                        to_points(np.array(((l_space, l_space), (r_space, r_space))), origin),
                         start_angle,
                         end_angle,
                         fill=clear_co,
@@ -157,23 +239,55 @@ class PieChart(NodeGraph):
 
         if gap:
             draw.line(
-                (
-                    (radius, radius), 
-                    circle_xy(radius, radius, start_angle)
-                ),
+                to_points(np.array((center, circle_xy(radius, radius, start_angle))), origin),
                 fill=clear_co, 
                 width=gap
             )
             
-            half_gap = gap / 2
-
             draw.ellipse(
-                (
-                    (radius - half_gap, radius - half_gap), 
-                    (radius + half_gap, radius + half_gap)
-                ),
+                to_boxes(np.array((center,)), gap / 2, origin)[0],
                 fill=clear_co, 
                 width=0
             )
+
+        cls._draw_labels(spec, image, ink, origin)
             
         return image
+
+    @classmethod
+    def _draw_labels(
+        cls, 
+        spec: GraphSpec, 
+        image: Image.Image,
+        ink: Callable,
+        offset: tuple[int, int]
+    ) -> None:
+        labels = spec.color('labels')
+        weights = spec.weights
+        total_weight = weights.sum()
+
+        if labels is None or total_weight == 0:
+            return
+
+        radius = spec.radius
+        label_ink = ink(labels)
+        distance = radius - spec.thickness / 2 if spec.thickness else radius * 0.6
+        start_angle = spec.angle
+
+        for weight, color in zip(weights.tolist(), spec.node_colors()):
+            angle = 360 / total_weight * weight
+
+            if color is not None and weight:
+                paste_text(
+                    image,
+                    circle_xy(radius, distance, start_angle + angle / 2),
+                    f'{weight / total_weight:.0%}',
+                    label_ink,
+                    font=spec.font,
+                    size=spec.fontsize,
+                    anchor='mm',
+                    bounds=(radius * 2, radius * 2),
+                    offset=offset
+                )
+
+            start_angle += angle
@@ -1,13 +1,20 @@
+import math
+import numpy as np
+from typing import Any, Callable, Literal
 from pinkie import Color
 from PIL import Image, ImageDraw
 
-from .graph import NodeGraph
-from .utils import interpolate, linear_to_circle, Interpolation
+from .graph import NodeGraph, Mode
+from .spec import GraphSpec, pack_color
+from .text import format_tick, paste_text
+from .utils import circle_xy, interpolate, linear_to_circle, to_boxes, to_points, Interpolation
 
 
 class RadarChart(NodeGraph):
     """Class representing a radar chart."""
 
+    _size_param = 'radius'
+
     def __init__(
         self,
         radius: int,
@@ -17,10 +24,18 @@ class RadarChart(NodeGraph):
         outline: Color | int | str | tuple[int, int, int] | tuple[int, int, int, int] | None = ...,
         pwidth: int = 0,
         onlysrc: bool = True,
-        npoints: int | None = None,
+        npoints: int | Literal['auto'] | None = None,
         interp: Interpolation = 'linear',
         angle: int | float = 0,
-        minr: int = 0
+        minr: int = 0,
+        axes: Color | int | str | tuple[int, int, int] | tuple[int, int, int, int] | None = None,
+        grid: Color | int | str | tuple[int, int, int] | tuple[int, int, int, int] | None = None,
+        labels: Color | int | str | tuple[int, int, int] | tuple[int, int, int, int] | None = None,
+        rings: int = 4,
+        font: str | None = None,
+        fontsize: int = 10,
+        background: Color | int | str | tuple[int, int, int] | tuple[int, int, int, int] | None = None,
+        mode: Mode | None = 'RGBA'
     ) -> None:
         """
         Parameters
@@ -30,21 +45,39 @@ class RadarChart(NodeGraph):
         thickness: `int`
             Line thickness.
         fill: `Color`
-            Fill color. If = `...`, generates a random color.
+            Fill color. If = `...`, a color is generated from the graph type.
         outline: `Color`
-            Line color. If = `...`, generates a random color.
+            Line color. If = `...`, a color is generated from the graph type.
         pwidth: `int`
             Point width.
         onlysrc: `bool`
             To draw bold dots only in source points (without interpolated ones).
-        npoints: `int` | `None`
+        npoints: `int` | `str` | `None`
             Number of points. If `None`, equals to the number of nodes.
+            If `auto`, the outline gets a point per 2 pixels of its length.
         interp: `str`
             Kind of interpolation. Used to make a smooth curve.
         angle: `int` | `float`
             Start angle of the chart.
         minr: `int`
             Minimum distance between the center and a point.
+        axes: `Color` | `None`
+            Color of the spokes going to the nodes. If `None`, no spokes will be drawn.
+        grid: `Color` | `None`
+            Color of the grid rings. If `None`, no rings will be drawn.
+        labels: `Color` | `None`
+            Ring label color. If `None`, no labels will be drawn.
+        rings: `int`
+            Number of grid rings.
+        font: `str` | `None`
+            Label font path or name. If `None`, the default font is used.
+        fontsize: `int`
+            Label font size.
+        background: `Color` | `None`
+            Background color. If `None`, the background is transparent.
+        mode: `str` | `None`
+            Image mode: `RGBA`, `P` or `LA`.
+            If `None`, the most compact mode for the graph colors is used.
         """
         super().__init__()
 
@@ -58,6 +91,14 @@ class RadarChart(NodeGraph):
         self.interp = interp
         self.angle = angle
         self.minr = minr
+        self.axes = axes
+        self.grid = grid
+        self.labels = labels
+        self.rings = rings
+        self.font = font
+        self.fontsize = fontsize
+        self.background = background
+        self.mode = mode
 
     @property
     def radius(self) -> int:
@@ -80,28 +121,24 @@ class RadarChart(NodeGraph):
     @property
     def fill(self) -> Color | None:
         """Shape color. If `None`, no shape will be drawn."""
-        return self._fill
+        return self._auto_color(self._fill, 'fill')
     
     @fill.setter
     def fill(self, value: Color | int | str | tuple | None):
-        if isinstance(value, Color) or value is None:
+        if isinstance(value, Color) or value is None or value is ...:
             self._fill = value
-        elif value is ...:
-            self._fill = Color.random()
         else:
             self._fill = Color(value)
 
     @property
     def outline(self) -> Color | None:
         """Line color. If `None`, no line will be drawn."""
-        return self._outline
+        return self._auto_color(self._outline, 'outline')
     
     @outline.setter
     def outline(self, value: Color | int | str | tuple | None):
-        if isinstance(value, Color) or value is None:
+        if isinstance(value, Color) or value is None or value is ...:
             self._outline = value
-        elif value is ...:
-            self._outline = Color.random()
         else:
             self._outline = Color(value)
 
@@ -124,12 +161,14 @@ class RadarChart(NodeGraph):
         self._onlysrc = value
     
     @property
-    def npoints(self) -> int | None:
+    def npoints(self) -> int | Literal['auto'] | None:
         """Number of points."""
         return self._npoints
     
     @npoints.setter
-    def npoints(self, value: int | None):
+    def npoints(self, value: int | Literal['auto'] | None):
+        if isinstance(value, str) and value != 'auto':
+            raise ValueError(f"unsupported number of points: {value}")
         self._npoints = value
       
     @property
@@ -159,64 +198,272 @@ class RadarChart(NodeGraph):
     def minr(self, value: int):
         self._minr = value
         
-    def draw(self) -> Image.Image:
-        w = self.radius * 2
-        image = Image.new('RGBA', (w, w))
+    @property
+    def axes(self) -> Color | None:
+        """Spoke color. If `None`, no spokes will be drawn."""
+        return self._axes
+    
+    @axes.setter
+    def axes(self, value: Color | int | str | tuple | None):
+        self._axes = value if isinstance(value, Color) or value is None else Color(value)
 
-        if len(self.nodes) in {0, 1, 2}:
-            return image
+    @property
+    def grid(self) -> Color | None:
+        """Ring color. If `None`, no rings will be drawn."""
+        return self._grid
+    
+    @grid.setter
+    def grid(self, value: Color | int | str | tuple | None):
+        self._grid = value if isinstance(value, Color) or value is None else Color(value)
 
-        nodes = self.nodes.copy()
-        nodes.append(nodes[0])
-        num_nodes = len(nodes)
-        
-        draw = ImageDraw.Draw(image)
+    @property
+    def labels(self) -> Color | None:
+        """Ring label color. If `None`, no labels will be drawn."""
+        return self._labels
+    
+    @labels.setter
+    def labels(self, value: Color | int | str | tuple | None):
+        self._labels = value if isinstance(value, Color) or value is None else Color(value)
 
-        thickness = self.thickness
-        num = self.npoints if self.npoints is not None else num_nodes
-        max_weight = max((i.weight for i in nodes))
-        radius = self.pwidth / 2 if self.pwidth > 0 else thickness / 2
- 
+    @property
+    def rings(self) -> int:
+        """Number of grid rings."""
+        return self._rings
+    
+    @rings.setter
+    def rings(self, value: int):
+        self._rings = value
+
+    @property
+    def font(self) -> str | None:
+        """Label font path or name."""
+        return self._font
+    
+    @font.setter
+    def font(self, value: str | None):
+        self._font = value
+
+    @property
+    def fontsize(self) -> int:
+        """Label font size."""
+        return self._fontsize
+    
+    @fontsize.setter
+    def fontsize(self, value: int):
+        self._fontsize = value
+
+    @property
+    def colors(self) -> list[Color]:
+        return [
+            c for c in (self.fill, self.outline, self.axes, self.grid, self.labels) 
+            if c is not None
+        ]
+
+    def _resolution(self) -> int:
+        return max(int(2 * math.pi * self.radius), 1)
+
+    def _params(self) -> dict[str, Any]:
+        return super()._params() | {
+            'radius': self.radius,
+            'thickness': self.thickness,
+            'fill': pack_color(self.fill),
+            'outline': pack_color(self.outline),
+            'pwidth': self.pwidth,
+            'onlysrc': self.onlysrc,
+            'npoints': self.npoints,
+            'interp': self.interp,
+            'angle': self.angle,
+            'minr': self.minr,
+            'axes': pack_color(self.axes),
+            'grid': pack_color(self.grid),
+            'labels': pack_color(self.labels),
+            'rings': self.rings,
+            'font': self.font,
+            'fontsize': self.fontsize
+        }
+
+    @classmethod
+    def _image_size(cls, spec: GraphSpec) -> tuple[int, int]:
+        return (spec.radius * 2, spec.radius * 2)
+
+    @classmethod
+    def _shape(cls, spec: GraphSpec) -> list[tuple[float, float]] | None:
+        if len(spec.weights) in {0, 1, 2}:
+            return None
+
+        weights = np.append(spec.weights, spec.weights[0])
+        num_nodes = len(weights)
+        max_weight = weights.max()
+
+        # the outline unrolled into a line with x from 0 to 1
         source_p = list(zip(
-            [w / (num_nodes - 1) * i for i in range(num_nodes)], 
-            [max_weight - node.weight for node in nodes]
+            [i / (num_nodes - 1) for i in range(num_nodes)], 
+            max_weight - weights
         ))
-        smooth_p = interpolate(source_p, num, kind=self.interp)
-        circle_p = linear_to_circle(
-            smooth_p, 
-            self.radius - self.pwidth, 
-            self.minr,
-            self.angle
+
+        if spec.npoints != 'auto':
+            num = spec.npoints if spec.npoints is not None else num_nodes
+            return interpolate(source_p, num, kind=spec.interp)
+        
+        # outline length measured on a coarse curve, then a chord
+        # of about 2 pixels per point, with every node among the points
+        coarse = np.array(cls._place(spec, interpolate(
+            source_p, 
+            8 * (num_nodes - 1) + 1, 
+            kind=spec.interp
+        )))
+        length = np.hypot(*np.diff(coarse, axis=0).T).sum()
+        per_node = max(math.ceil(length / 2 / (num_nodes - 1)), 1)
+
+        return interpolate(source_p, per_node * (num_nodes - 1) + 1, kind=spec.interp)
+
+    @classmethod
+    def _place(
+        cls, 
+        spec: GraphSpec, 
+        shape: list[tuple[float, float]] | None
+    ) -> list[tuple[float, float]] | None:
+        if shape is None:
+            return None
+        return linear_to_circle(
+            shape, 
+            spec.radius - spec.pwidth, 
+            spec.minr,
+            spec.angle
         )
 
-        if self.fill:
+    @classmethod
+    def _rasterize(
+        cls, 
+        spec: GraphSpec, 
+        geometry: list[tuple[float, float]] | None, 
+        box: tuple[int, int, int, int]
+    ) -> Image.Image:
+        x0, y0, x1, y1 = box
+        image, ink = cls._base_image(spec, box)
+
+        if geometry is None:
+            return image
+
+        cls._draw_data(spec, geometry, ImageDraw.Draw(image), ink, (x0, y0))
+        cls._draw_labels(spec, image, ink, (x0, y0))
+
+        return image
+
+    @classmethod
+    def _static_key(cls, spec: GraphSpec) -> tuple | None:
+        if spec.axes is None and spec.grid is None:
+            return None
+        return (
+            spec.radius, spec.pwidth, spec.minr, spec.rings, spec.angle, 
+            spec.axes, spec.grid, len(spec.weights) if spec.axes is not None else 0
+        )
+
+    @classmethod
+    def _draw_static(
+        cls, 
+        spec: GraphSpec, 
+        image: Image.Image,
+        ink: Callable, 
+        offset: tuple[int, int]
+    ) -> None:
+        draw = ImageDraw.Draw(image)
+        grid = spec.color('grid')
+        axes = spec.color('axes')
+        center = spec.radius - spec.pwidth
+
+        if grid is not None:
+            for radius in np.linspace(spec.minr, center, spec.rings + 1)[1:].tolist():
+                draw.ellipse(
+                    to_boxes(np.array(((center, center),)), radius, offset)[0],
+                    outline=ink(grid),
+                    width=1
+                )
+
+        num_nodes = len(spec.weights)
+        if axes is not None and num_nodes > 2:
+            for i in range(num_nodes):
+                draw.line(
+                    to_points(np.array((
+                        (center, center), 
+                        circle_xy(center, center, spec.angle + 360 / num_nodes * i)
+                    )), offset),
+                    fill=ink(axes),
+                    width=1
+                )
+
+    @classmethod
+    def _draw_labels(
+        cls, 
+        spec: GraphSpec, 
+        image: Image.Image,
+        ink: Callable,
+        offset: tuple[int, int]
+    ) -> None:
+        labels = spec.color('labels')
+        if labels is None:
+            return
+
+        w = spec.radius * 2
+        center = spec.radius - spec.pwidth
+        label_ink = ink(labels)
+        weights = spec.weights
+        radii = np.linspace(spec.minr, center, spec.rings + 1)[1:]
+        values = np.linspace(weights.min(), weights.max(), spec.rings + 1)[1:]
+
+        for radius, value in zip(radii.tolist(), values.tolist()):
+            paste_text(
+                image,
+                circle_xy(center, radius, spec.angle),
+                format_tick(value),
+                label_ink,
+                font=spec.font,
+                size=spec.fontsize,
+                anchor='ld',
+                bounds=(w, w),
+                offset=offset
+            )
+
+    @classmethod
+    def _draw_data(
+        cls, 
+        spec: GraphSpec, 
+        circle_p: list[tuple[float, float]],
+        draw: ImageDraw.ImageDraw, 
+        ink: Callable,
+        offset: tuple[int, int]
+    ) -> None:
+        fill = spec.color('fill')
+        outline = spec.color('outline')
+        thickness = spec.thickness
+        points = np.array(circle_p)
+        circle_p = to_points(points, offset)
+        num = len(circle_p)
+        num_nodes = len(spec.weights) + 1
+        radius = spec.pwidth / 2 if spec.pwidth > 0 else thickness / 2
+
+        if fill:
             draw.polygon(
                 circle_p,
-                fill=self.fill.rgba, 
-                outline=self.outline.rgba,
+                fill=ink(fill), 
+                outline=ink(outline),
                 width=0
             )
 
-        if self.outline:
+        if outline:
             draw.line(
                 circle_p, 
-                fill=self.outline.rgba, 
+                fill=ink(outline), 
                 width=thickness, 
                 joint='curve'
             )
 
-            bold_p = (circle_p[0],)
-            if self.pwidth > 0:
-                step = num // num_nodes
-                bold_p = circle_p[::step] if self.onlysrc and step else circle_p
-
-            for p in bold_p:
-                draw.ellipse(
-                    (p[0] - radius, p[1] - radius,
-                    p[0] + radius, p[1] + radius),
-                    fill=self.outline.rgba, 
-                    width=0
-                )
-
-        return image
+            bold_p = points[:1]
+            if spec.pwidth > 0 and spec.onlysrc:
+                # points closest to the nodes, spaced the same way as in `_shape`
+                bold_p = points[np.round(np.linspace(0, num - 1, num_nodes)).astype(np.int64)]
+            elif spec.pwidth > 0:
+                bold_p = points
 
+            for box in to_boxes(bold_p, radius, offset):
+                draw.ellipse(box, fill=ink(outline), width=0)
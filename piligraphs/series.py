@@ -0,0 +1,377 @@
+import math
+import numpy as np
+from typing import Iterable, Iterator
+
+
+CHUNK_SIZE = 1 << 20
+
+Source = np.ndarray | Iterable[np.ndarray] | Iterable[float]
+
+
+def iter_chunks(source: Source, chunksize: int = CHUNK_SIZE) -> Iterator[np.ndarray]:
+    """
+    Iterate over a weight source chunk by chunk.
+    Arrays (including memory maps) are sliced without copying,
+    other iterables are expected to yield chunks or single values.
+
+    Parameters
+    ----------
+    source: `Source`
+        Array, memory map or iterable of chunks.
+    chunksize: `int`
+        Chunk length used to slice arrays.
+    """
+    if isinstance(source, np.ndarray):
+        source = source.ravel()
+        for start in range(0, len(source), chunksize):
+            yield source[start:start + chunksize]
+        return
+
+    values = []
+    for chunk in source:
+        if np.ndim(chunk) == 0:
+            values.append(chunk)
+            if len(values) >= chunksize:
+                yield np.asarray(values, dtype=np.float64)
+                values = []
+            continue
+
+        if values:
+            yield np.asarray(values, dtype=np.float64)
+            values = []
+        yield np.asarray(chunk).ravel()
+
+    if values:
+        yield np.asarray(values, dtype=np.float64)
+
+
+def minmax_reduce(
+    chunks: Iterable[np.ndarray],
+    num: int,
+    total: int | None = None
+) -> tuple[np.ndarray, np.ndarray, int]:
+    """
+    Reduce a series to per-column minimums and maximums.
+    Chunks are processed one by one, so memory use depends only on `num`
+    and the chunk size. Returns minimums, maximums and the series length.
+
+    With a known length, sample `i` goes to column `i * num // total`,
+    whatever the chunks are. Otherwise the series is reduced to blocks
+    aligned to sample indices, so the result does not depend on the chunks
+    either, but blocks on column edges go to one of the columns.
+
+    Parameters
+    ----------
+    chunks: `Iterable[np.ndarray]`
+        Series chunks.
+    num: `int`
+        Number of columns.
+    total: `int` | `None`
+        Series length, if known.
+    """
+    if num < 1:
+        raise ValueError("number of columns should be positive")
+
+    if total is not None:
+        return _reduce_columns(chunks, min(num, total), total)
+
+    mins = np.empty(0, dtype=np.float64)
+    maxs = np.empty(0, dtype=np.float64)
+    starts = np.empty(0, dtype=np.int64)
+    step = 1
+    total = 0
+
+    for chunk in chunks:
+        size = len(chunk)
+        if size == 0:
+            continue
+
+        # blocks start at multiples of the step, the first block
+        # of a chunk can continue the last block of the previous one
+        first = -total % step
+        edges = np.arange(first, size, step)
+        if first:
+            edges = np.concatenate(([0], edges))
+        mins = np.concatenate((mins, np.minimum.reduceat(chunk, edges)))
+        maxs = np.concatenate((maxs, np.maximum.reduceat(chunk, edges)))
+        starts = np.concatenate((starts, edges + total))
+        total += size
+
+        # merge blocks into twice as long ones until the budget is met
+        while True:
+            blocks = starts // step
+            edges = np.flatnonzero(np.diff(blocks, prepend=-1))
+            if len(edges) < len(blocks):
+                mins = np.minimum.reduceat(mins, edges)
+                maxs = np.maximum.reduceat(maxs, edges)
+                starts = blocks[edges] * step
+            # blocks much shorter than columns keep column edges close
+            if len(starts) <= 16 * num:
+                break
+            step *= 2
+
+    if total == 0:
+        return mins, maxs, 0
+
+    columns = starts * min(num, total) // total
+    edges = np.flatnonzero(np.diff(columns, prepend=-1))
+
+    return (
+        np.minimum.reduceat(mins, edges),
+        np.maximum.reduceat(maxs, edges),
+        total
+    )
+
+
+def _reduce_columns(
+    chunks: Iterable[np.ndarray],
+    num: int,
+    total: int
+) -> tuple[np.ndarray, np.ndarray, int]:
+    mins = np.full(num, np.inf)
+    maxs = np.full(num, -np.inf)
+    offset = 0
+
+    for chunk in chunks:
+        size = len(chunk)
+        if size == 0:
+            continue
+
+        # columns touched by the chunk and where they start in it,
+        # the first one can be carried over from the previous chunk
+        columns = np.arange(
+            offset * num // total, 
+            (offset + size - 1) * num // total + 1
+        )
+        edges = np.maximum(-(-columns * total // num) - offset, 0)
+        mins[columns] = np.minimum(mins[columns], np.minimum.reduceat(chunk, edges))
+        maxs[columns] = np.maximum(maxs[columns], np.maximum.reduceat(chunk, edges))
+        offset += size
+
+    if offset != total:
+        raise ValueError(f"series length is {offset}, not {total}")
+
+    return mins, maxs, total
+
+
+def lod(source: Source, num: int, chunksize: int = CHUNK_SIZE) -> np.ndarray:
+    """
+    Build a level-of-detail series from a weight source.
+    Every column is represented by its minimum and maximum,
+    so peaks survive the reduction. Series not longer 
+    than `num` are returned as is.
+
+    Parameters
+    ----------
+    source: `Source`
+        Array, memory map or iterable of chunks.
+    num: `int`
+        Number of columns.
+    chunksize: `int`
+        Chunk length used to slice arrays.
+    """
+    return _lod(source, num, chunksize)[0]
+
+
+def _lod(source: Source, num: int, chunksize: int = CHUNK_SIZE) -> tuple[np.ndarray, int]:
+    # the series length is returned too, one-shot iterators can't be measured later
+    total = None
+    if isinstance(source, np.ndarray):
+        if source.size <= num:
+            # a copy, so later changes of the source do not leak into specs
+            return np.array(source, dtype=np.float64).ravel(), source.size
+        total = source.size
+    elif isinstance(source, (list, tuple)):
+        total = sum(np.size(chunk) for chunk in source)
+
+    mins, maxs, total = minmax_reduce(iter_chunks(source, chunksize), num, total)
+
+    if total <= num:
+        return mins, total
+
+    return np.column_stack((mins, maxs)).ravel(), total
+
+
+class SeriesIndex:
+    """
+    Multi-resolution min/max pyramid over a series.
+
+    Every level stores the minimums and maximums of blocks twice as long
+    as the previous one, so any range can be reduced to pixel columns 
+    by reading `O(columns * log(length))` values, whatever the zoom.
+    """
+
+    def __init__(
+        self,
+        weights: np.ndarray,
+        x: np.ndarray | None = None,
+        *,
+        leaf: int = 8,
+        chunksize: int = CHUNK_SIZE
+    ) -> None:
+        """
+        Parameters
+        ----------
+        weights: `np.ndarray`
+            Series values. Can be a memory map, it is not copied.
+        x: `np.ndarray` | `None`
+            Sorted x values of the series, e.g. timestamps.
+            If `None`, sample indices are used.
+        leaf: `int`
+            Length of the shortest stored block, a power of 2.
+            Shorter blocks are read from `weights` directly,
+            so bigger leaves take less memory.
+        chunksize: `int`
+            Chunk length used to build the pyramid.
+        """
+        weights = np.asarray(weights).ravel()
+
+        if leaf < 1 or leaf & (leaf - 1):
+            raise ValueError("leaf should be a power of 2")
+        if x is not None:
+            x = np.asarray(x).ravel()
+            if len(x) != len(weights):
+                raise ValueError("x and weights should have the same length")
+        
+        self._weights = weights
+        self._x = x
+        self._base = leaf.bit_length() - 1
+        self._mins: list[np.ndarray] = []
+        self._maxs: list[np.ndarray] = []
+
+        step = max(chunksize // leaf, 1) * leaf
+        blocks = len(weights) // leaf
+        mins = np.empty(blocks, dtype=np.float64)
+        maxs = np.empty(blocks, dtype=np.float64)
+
+        for start in range(0, blocks * leaf, step):
+            chunk = weights[start:min(start + step, blocks * leaf)].reshape(-1, leaf)
+            mins[start // leaf:start // leaf + len(chunk)] = chunk.min(axis=1)
+            maxs[start // leaf:start // leaf + len(chunk)] = chunk.max(axis=1)
+
+        while len(mins):
+            self._mins.append(mins)
+            self._maxs.append(maxs)
+            even = len(mins) // 2 * 2
+            mins = np.minimum(mins[0:even:2], mins[1:even:2])
+            maxs = np.maximum(maxs[0:even:2], maxs[1:even:2])
+
+    def __len__(self) -> int:
+        return len(self._weights)
+
+    @property
+    def weights(self) -> np.ndarray:
+        """Series values."""
+        return self._weights
+
+    @property
+    def x(self) -> np.ndarray | None:
+        """Sorted x values."""
+        return self._x
+
+    def _blocks(self, level: int, blocks: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        if level >= self._base:
+            return self._mins[level - self._base][blocks], self._maxs[level - self._base][blocks]
+        
+        size = 1 << level
+        values = self._weights[(blocks[:, None] * size + np.arange(size)).ravel()]
+        values = np.asarray(values, dtype=np.float64).reshape(-1, size)
+        return values.min(axis=1), values.max(axis=1)
+
+    def _reduce(self, lo: np.ndarray, hi: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        mins = np.full(len(lo), np.inf)
+        maxs = np.full(len(lo), -np.inf)
+        lo = lo.copy()
+        hi = hi.copy()
+        level = 0
+
+        # bottom-up segment tree walk, vectorized over all ranges
+        while np.any(lo < hi):
+            mask = (lo < hi) & (lo & 1 == 1)
+            if np.any(mask):
+                bmin, bmax = self._blocks(level, lo[mask])
+                mins[mask] = np.minimum(mins[mask], bmin)
+                maxs[mask] = np.maximum(maxs[mask], bmax)
+                lo[mask] += 1
+
+            mask = (lo < hi) & (hi & 1 == 1)
+            if np.any(mask):
+                bmin, bmax = self._blocks(level, hi[mask] - 1)
+                mins[mask] = np.minimum(mins[mask], bmin)
+                maxs[mask] = np.maximum(maxs[mask], bmax)
+                hi[mask] -= 1
+            
+            lo >>= 1
+            hi >>= 1
+            level += 1
+
+        return mins, maxs
+
+    def range(self, x0: float, x1: float) -> tuple[int, int]:
+        """
+        Find indices of samples between two x values.
+
+        Parameters
+        ----------
+        x0: `float`
+            Start x value.
+        x1: `float`
+            End x value (inclusive).
+        """
+        if self._x is None:
+            start, end = math.ceil(x0), math.floor(x1) + 1
+        else:
+            start = int(np.searchsorted(self._x, x0, side='left'))
+            end = int(np.searchsorted(self._x, x1, side='right'))
+        
+        return max(start, 0), min(end, len(self._weights))
+
+    def query(
+        self,
+        num: int,
+        viewport: tuple[float, float] | None = None
+    ) -> np.ndarray:
+        """
+        Reduce a part of the series to per-column minimums and maximums.
+        Returns values in the format of `lod`. Columns with no samples
+        repeat the last value before them.
+
+        Parameters
+        ----------
+        num: `int`
+            Number of columns.
+        viewport: `tuple[float, float]` | `None`
+            Start and end x values. If `None`, the whole series is used.
+        """
+        if num < 1:
+            raise ValueError("number of columns should be positive")
+        
+        if viewport is None:
+            start, end = 0, len(self._weights)
+        else:
+            start, end = self.range(*viewport)
+
+        if end <= start:
+            return np.empty(0, dtype=np.float64)
+
+        if self._x is None:
+            if end - start <= num:
+                return np.array(self._weights[start:end], dtype=np.float64)
+            edges = start + np.arange(num + 1) * (end - start) // num
+        else:
+            x0, x1 = viewport if viewport is not None else (self._x[0], self._x[-1])
+            edges = np.searchsorted(self._x, np.linspace(x0, x1, num + 1), side='left')
+            edges[-1] = end
+            edges = np.clip(edges, start, end)
+
+        lo, hi = edges[:-1], edges[1:]
+        mins, maxs = self._reduce(lo, hi)
+
+        empty = lo >= hi
+        if np.any(empty):
+            # hold the last value before a gap
+            fill = self._weights[np.maximum(lo[empty] - 1, 0)]
+            mins[empty] = fill
+            maxs[empty] = fill
+
+        return np.column_stack((mins, maxs)).ravel()
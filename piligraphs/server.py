@@ -0,0 +1,296 @@
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qsl
+
+from .spec import GraphSpec
+
+
+CONTENT_TYPES = {
+    'PNG': 'image/png',
+    'WEBP': 'image/webp',
+    'GIF': 'image/gif',
+    'JPEG': 'image/jpeg'
+}
+
+
+def _render(data: bytes, format: str, quality: int | None) -> bytes:
+    return GraphSpec.loads(data).render_bytes(format, quality=quality)
+
+
+class RenderStats:
+    """Thread-safe counters of a render server."""
+
+    def __init__(self, window: int = 1000) -> None:
+        """
+        Parameters
+        ----------
+        window: `int`
+            Number of recent requests used for latency percentiles.
+        """
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._requests = 0
+        self._renders = 0
+        self._cache_hits = 0
+        self._errors = 0
+
+    def record(self, latency: float, *, rendered: bool, error: bool = False) -> None:
+        """
+        Record a finished request.
+
+        Parameters
+        ----------
+        latency: `float`
+            Request latency in seconds.
+        rendered: `bool`
+            Whether the image was rendered or taken from the cache.
+        error: `bool`
+            Whether the request failed.
+        """
+        with self._lock:
+            self._requests += 1
+            if error:
+                self._errors += 1
+                return
+
+            self._latencies.append(latency)
+            if rendered:
+                self._renders += 1
+            else:
+                self._cache_hits += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Current stats as a JSON-compatible dictionary."""
+        with self._lock:
+            uptime = time.monotonic() - self._started
+            latencies = sorted(self._latencies)
+            requests = self._requests
+            stats = {
+                'uptime': uptime,
+                'requests': requests,
+                'renders': self._renders,
+                'cache_hits': self._cache_hits,
+                'errors': self._errors,
+                'throughput': requests / uptime if uptime else 0.0
+            }
+
+        def percentile(p: float) -> float | None:
+            if not latencies:
+                return None
+            return latencies[min(int(len(latencies) * p), len(latencies) - 1)]
+
+        stats['latency'] = {
+            'mean': sum(latencies) / len(latencies) if latencies else None,
+            'p50': percentile(0.5),
+            'p95': percentile(0.95),
+            'max': latencies[-1] if latencies else None
+        }
+        return stats
+
+
+class RenderServer(ThreadingHTTPServer):
+    """
+    HTTP server rendering graph specs on a worker pool.
+
+    Endpoints
+    ---------
+    `POST /render`
+        JSON spec (see `GraphSpec.from_dict`) with optional `format`
+        and `quality` keys, or a binary spec (see `GraphSpec.dumps`)
+        with `format` and `quality` passed as query parameters.
+        Responds with the encoded image.
+    `GET /stats`
+        Throughput, latency and cache stats.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int] = ('127.0.0.1', 8000),
+        *,
+        executor: Executor | None = None,
+        workers: int | None = None,
+        cache_size: int = 256,
+        max_body: int = 64 * 1024 * 1024
+    ) -> None:
+        """
+        Parameters
+        ----------
+        address: `tuple[str, int]`
+            Host and port to listen on. Port 0 picks a free port.
+        executor: `Executor` | `None`
+            Executor to render in. If `None`, a process pool is created
+            and shut down together with the server.
+        workers: `int` | `None`
+            Number of worker processes of the created pool.
+        cache_size: `int`
+            Maximum number of cached images. 0 disables the cache.
+        max_body: `int`
+            Maximum request body size in bytes.
+        """
+        super().__init__(address, _RenderHandler)
+
+        self._owns_executor = executor is None
+        self.executor = executor or ProcessPoolExecutor(workers)
+        self.cache_size = cache_size
+        self.max_body = max_body
+        self.stats = RenderStats()
+        self._cache: OrderedDict[tuple, bytes] = OrderedDict()
+        self._pending: dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+
+    def render(
+        self, 
+        spec: GraphSpec, 
+        format: str = 'PNG', 
+        quality: int | None = None
+    ) -> tuple[bytes, bool]:
+        """
+        Render a spec using the cache.
+        Concurrent requests for the same image share one render.
+        Returns the encoded image and whether it was rendered.
+
+        Parameters
+        ----------
+        spec: `GraphSpec`
+            Spec to render.
+        format: `str`
+            Image format.
+        quality: `int` | `None`
+            Encoding quality.
+        """
+        data = spec.dumps()
+        key = (spec.key, format, quality)
+
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key], False
+
+            future = self._pending.get(key)
+            owner = future is None
+            if owner:
+                future = self.executor.submit(_render, data, format, quality)
+                self._pending[key] = future
+
+        try:
+            result = future.result()
+        finally:
+            if owner:
+                with self._lock:
+                    self._pending.pop(key, None)
+
+        if owner and self.cache_size > 0:
+            with self._lock:
+                self._cache[key] = result
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return result, owner
+
+    def server_close(self) -> None:
+        super().server_close()
+        if self._owns_executor:
+            self.executor.shutdown(cancel_futures=True)
+
+
+class _RenderHandler(BaseHTTPRequestHandler):
+    server: RenderServer
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def _send(self, status: HTTPStatus, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: HTTPStatus, data: Any) -> None:
+        self._send(status, json.dumps(data).encode(), 'application/json')
+
+    def do_GET(self) -> None:
+        if self.path.split('?')[0] == '/stats':
+            self._send_json(HTTPStatus.OK, self.server.stats.snapshot())
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {'error': 'not found'})
+
+    def do_POST(self) -> None:
+        path, _, query = self.path.partition('?')
+        if path != '/render':
+            self._send_json(HTTPStatus.NOT_FOUND, {'error': 'not found'})
+            return
+
+        start = time.perf_counter()
+        rendered = False
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            if length > self.server.max_body:
+                raise ValueError("request body is too large")
+
+            body = self.rfile.read(length)
+            options = dict(parse_qsl(query))
+
+            if self.headers.get('Content-Type') == 'application/octet-stream':
+                spec = GraphSpec.loads(body)
+            else:
+                options = json.loads(body)
+                spec = GraphSpec.from_dict(options)
+
+            format = str(options.get('format', 'PNG')).upper()
+            quality = options.get('quality')
+            quality = None if quality is None else int(quality)
+
+            if format not in CONTENT_TYPES:
+                raise ValueError(f"unsupported format: {format}")
+
+            image, rendered = self.server.render(spec, format, quality)
+        except (ValueError, TypeError, KeyError) as e:
+            self.server.stats.record(0, rendered=False, error=True)
+            self._send_json(HTTPStatus.BAD_REQUEST, {'error': str(e)})
+            return
+        except Exception as e:
+            self.server.stats.record(0, rendered=False, error=True)
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(e)})
+            return
+
+        self.server.stats.record(time.perf_counter() - start, rendered=rendered)
+        self._send(HTTPStatus.OK, image, CONTENT_TYPES[format])
+
+
+def serve(
+    host: str = '127.0.0.1',
+    port: int = 8000,
+    *,
+    workers: int | None = None,
+    cache_size: int = 256
+) -> None:
+    """
+    Run a render server until interrupted.
+
+    Parameters
+    ----------
+    host: `str`
+        Host to listen on.
+    port: `int`
+        Port to listen on.
+    workers: `int` | `None`
+        Number of worker processes. If `None`, equals to the number of CPUs.
+    cache_size: `int`
+        Maximum number of cached images.
+    """
+    with RenderServer((host, port), workers=workers, cache_size=cache_size) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
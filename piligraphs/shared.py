@@ -0,0 +1,169 @@
+import traceback
+import numpy as np
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Iterable
+from PIL import Image
+
+from .graph import Graph
+from .spec import GraphSpec, get_graph_type
+
+
+def _draw_shared(
+    type_name: str,
+    params: dict[str, Any],
+    palette: tuple[int, ...],
+    count: int,
+    input_name: str,
+    output_name: str
+) -> tuple[str, tuple[int, int], list[int] | None]:
+    source = shared_memory.SharedMemory(input_name)
+    spec = None
+    try:
+        spec = GraphSpec(
+            get_graph_type(type_name),
+            params,
+            np.ndarray(count, '<f8', source.buf),
+            np.ndarray(count, '<i8', source.buf, count * 8),
+            palette
+        )
+        image = spec.draw()
+    except BaseException as e:
+        # frames of the traceback hold views of the segment too
+        traceback.clear_frames(e.__traceback__)
+        raise
+    finally:
+        # views of the segment should be released before closing it
+        spec = None
+        source.close()
+
+    target = shared_memory.SharedMemory(output_name)
+    try:
+        pixels = np.asarray(image)
+        np.ndarray(pixels.shape, pixels.dtype, target.buf)[...] = pixels
+    finally:
+        target.close()
+
+    return (
+        image.mode, 
+        image.size, 
+        image.getpalette('RGBA') if image.mode == 'P' else None
+    )
+
+
+class SharedRenderer:
+    """
+    Draws graphs in worker processes, passing node data and pixels
+    through shared memory instead of pickling them.
+
+    Workers read node arrays from a shared segment and copy the pixels
+    of the drawn image into another one, which the resulting image
+    maps without copying. The pixel segment is kept open by the image
+    and released together with it.
+    """
+
+    def __init__(
+        self,
+        executor: ProcessPoolExecutor | None = None,
+        *,
+        workers: int | None = None
+    ) -> None:
+        """
+        Parameters
+        ----------
+        executor: `ProcessPoolExecutor` | `None`
+            Process pool to draw in. If `None`, a new pool is created
+            and shut down together with the renderer.
+        workers: `int` | `None`
+            Number of worker processes of the created pool.
+        """
+        self._owns_executor = executor is None
+        self._executor = executor or ProcessPoolExecutor(workers)
+
+    def __enter__(self) -> 'SharedRenderer':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def submit(self, graph: Graph | GraphSpec) -> Future:
+        """
+        Start drawing a graph. Returns a future of the image.
+
+        Parameters
+        ----------
+        graph: `Graph` | `GraphSpec`
+            Graph or its snapshot.
+        """
+        spec = graph.freeze() if isinstance(graph, Graph) else graph
+        count = len(spec.weights)
+        w, h = spec.image_size
+
+        result = Future()
+        result.set_running_or_notify_cancel()
+        segments = []
+
+        try:
+            source = shared_memory.SharedMemory(create=True, size=max(count * 16, 1))
+            segments.append(source)
+            target = shared_memory.SharedMemory(create=True, size=max(w * h * 4, 1))
+            segments.append(target)
+
+            np.ndarray(count, '<f8', source.buf)[:] = spec.weights
+            np.ndarray(count, '<i8', source.buf, count * 8)[:] = spec.colors
+
+            future = self._executor.submit(
+                _draw_shared,
+                spec.type.__name__,
+                dict(spec.params),
+                spec.palette,
+                count,
+                source.name,
+                target.name
+            )
+        except BaseException:
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+            raise
+
+        def done(future: Future) -> None:
+            source.close()
+            source.unlink()
+            # the name is not needed anymore, the memory lives while mapped
+            target.unlink()
+            try:
+                mode, size, palette = future.result()
+                image = Image.frombuffer(
+                    mode, size, target.buf[:target.size], 'raw', mode, 0, 1
+                )
+                if palette is not None:
+                    image.putpalette(palette, 'RGBA')
+                # the segment is closed when the image (and its mapping) is gone
+                image._segment = target
+            except BaseException as e:
+                target.close()
+                result.set_exception(e)
+            else:
+                result.set_result(image)
+
+        future.add_done_callback(done)
+
+        return result
+
+    def draw_many(self, graphs: Iterable[Graph | GraphSpec]) -> list[Image.Image]:
+        """
+        Draw graphs in parallel.
+
+        Parameters
+        ----------
+        graphs: `Iterable[Graph | GraphSpec]`
+            Graphs or their snapshots.
+        """
+        futures = [self.submit(graph) for graph in graphs]
+        return [future.result() for future in futures]
+
+    def close(self) -> None:
+        """Shut down the created process pool."""
+        if self._owns_executor:
+            self._executor.shutdown()
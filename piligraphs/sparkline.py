@@ -0,0 +1,148 @@
+import math
+import numpy as np
+from pinkie import Color
+from PIL import Image, ImageDraw
+from scipy.interpolate import interp1d
+
+from .palette import generate_color
+from .utils import limit, Interpolation
+
+
+def _to_color(value: Color | int | str | tuple | None, name: str) -> Color | None:
+    if isinstance(value, Color) or value is None:
+        return value
+    if value is ...:
+        return generate_color('sparkline', name)
+    return Color(value)
+
+
+def draw_sparklines(
+    series: np.ndarray,
+    cell: tuple[int, int],
+    *,
+    columns: int | None = None,
+    gap: int = 1,
+    thickness: int = 1,
+    fill: Color | int | str | tuple[int, int, int] | tuple[int, int, int, int] | None = None,
+    outline: Color | int | str | tuple[int, int, int] | tuple[int, int, int, int] | None = ...,
+    npoints: int | None = None,
+    interp: Interpolation = 'linear',
+    minh: int = 0
+) -> tuple[Image.Image, np.ndarray]:
+    """
+    Draw many small line charts into one atlas image.
+    All series are scaled and interpolated together in one vectorized pass,
+    and every cell looks like a `LineChart` of the cell size drawn
+    with the same parameters (batched interpolation rounds a bit 
+    differently, so rare points can move by a pixel).
+    Returns the atlas and an array of cell boxes `(x0, y0, x1, y1)`
+    with shape `(len(series), 4)`.
+
+    Parameters
+    ----------
+    series: `np.ndarray`
+        2D array of weights, one series per row.
+    cell: `tuple[int, int]`
+        Width and height of a single chart.
+    columns: `int` | `None`
+        Number of cells in an atlas row.
+        If `None`, the atlas is about as wide as it is high.
+    gap: `int`
+        Space between the cells. Strokes on the cell edges
+        can overflow by a pixel, so without a gap neighbours can touch.
+    thickness: `int`
+        Line thickness.
+    fill: `Color` | `None`
+        Fill color. If = `...`, a color is generated.
+    outline: `Color` | `None`
+        Line color. If = `...`, a color is generated.
+    npoints: `int` | `None`
+        Number of points. If `None`, equals to the series length.
+    interp: `str`
+        Kind of interpolation. Used to make a smooth curve.
+    minh: `int`
+        Minimum height from the bottom of a chart.
+    """
+    series = np.asarray(series, dtype=np.float64)
+    if series.ndim != 2:
+        raise ValueError("series should be a 2D array")
+    if len(cell) != 2:
+        raise ValueError("cell should contain 2 items")
+
+    count, num_nodes = series.shape
+    w, h = cell
+    fill = _to_color(fill, 'fill')
+    outline = _to_color(outline, 'outline')
+
+    if columns is None:
+        columns = max(math.ceil(math.sqrt(count * h / w)), 1)
+    rows = math.ceil(count / columns)
+    index = np.arange(count)
+    origins = np.column_stack((index % columns * (w + gap), index // columns * (h + gap)))
+    boxes = np.hstack((origins, origins + (w, h)))
+
+    atlas = Image.new('RGBA', (
+        max(columns * (w + gap) - gap, 0),
+        max(rows * (h + gap) - gap, 0)
+    ))
+
+    if count == 0 or num_nodes in {0, 1}:
+        return atlas, boxes
+
+    radius = thickness / 2
+    num = npoints or num_nodes
+
+    # the same scaling as LineChart, applied to every row at once
+    xs = limit(
+        [w / (num_nodes - 1) * i for i in range(num_nodes)], 
+        radius, 
+        w - radius
+    )
+
+    max_weights = series.max(axis=1, keepdims=True)
+    values = max_weights - series
+    vmin = values.min(axis=1, keepdims=True)
+    vmax = values.max(axis=1, keepdims=True)
+    flat = vmax == vmin
+    maxv = h - radius - minh
+    m = (maxv - radius) / np.where(flat, 1, vmax - vmin)
+    ys = np.where(flat, values, m * values + (maxv - m * vmax))
+    ys = np.where(flat & (max_weights == 0), h - radius, ys)
+
+    smooth_x = np.linspace(xs[0], xs[-1], num)
+    smooth_y = interp1d(xs, ys, kind=interp, axis=1)(smooth_x)
+    smooth_y = np.clip(smooth_y, ys.min(axis=1, keepdims=True), ys.max(axis=1, keepdims=True))
+
+    points = np.empty((count, num, 2))
+    points[..., 0] = smooth_x
+    points[..., 1] = smooth_y
+    ends = points[:, [0, -1]]
+    ends = np.concatenate((ends - radius, ends + radius), axis=2)
+
+    # Pillow truncates coordinates, so they are floored before moving 
+    # into the cells to keep every cell identical to a standalone chart
+    points = np.floor(points) + origins[:, None, :]
+    ends = np.floor(ends) + np.tile(origins, 2)[:, None, :]
+
+    bottoms = (origins[:, 1] + h).tolist()
+    lines = points.tolist()
+    ends = ends.tolist()
+
+    draw = ImageDraw.Draw(atlas)
+    fill_ink = fill.rgba if fill else None
+    outline_ink = outline.rgba if outline else None
+
+    for line, bottom, (first, last) in zip(lines, bottoms, ends):
+        if fill_ink:
+            draw.polygon(
+                [(line[0][0], bottom)] + line + [(line[-1][0], bottom)],
+                fill=fill_ink,
+                width=0
+            )
+
+        if outline_ink:
+            draw.line(line, fill=outline_ink, width=thickness, joint='curve')
+            draw.ellipse(first, fill=outline_ink, width=0)
+            draw.ellipse(last, fill=outline_ink, width=0)
+
+    return atlas, boxes
@@ -0,0 +1,448 @@
+import hashlib
+import json
+import struct
+import numpy as np
+from collections import deque
+from concurrent.futures import Executor
+from functools import partial
+from types import MappingProxyType
+from typing import Any, BinaryIO, Iterator, Mapping, Sequence, TYPE_CHECKING
+from pinkie import Color
+from PIL import Image
+
+from .utils import encode, write_png
+if TYPE_CHECKING:
+    from .graph import Graph
+
+
+NO_COLOR = -1
+MAGIC = b'PLGS'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sBI')
+_graph_types: dict[str, 'type[Graph]'] = {}
+
+
+def register_graph(graph_type: 'type[Graph]') -> None:
+    """
+    Register a graph class, so its specs can be loaded by name.
+
+    Parameters
+    ----------
+    graph_type: `type[Graph]`
+        Graph class.
+    """
+    _graph_types[graph_type.__name__] = graph_type
+
+
+def get_graph_type(name: str) -> 'type[Graph]':
+    """
+    Get a registered graph class by name.
+
+    Parameters
+    ----------
+    name: `str`
+        Class name.
+    """
+    try:
+        return _graph_types[name]
+    except KeyError:
+        raise ValueError(f"unknown graph type: {name}") from None
+
+
+def pack_color(color: Color | None) -> int | None:
+    """Pack a color into an integer."""
+    return None if color is None else int(color)
+
+
+def unpack_color(value: int | None) -> Color | None:
+    """Unpack a color packed by `pack_color` or `NO_COLOR`."""
+    return None if value is None or value == NO_COLOR else Color(int(value))
+
+
+def readonly(array: np.ndarray) -> np.ndarray:
+    """Make an array read-only without copying it."""
+    array = array.view()
+    array.flags.writeable = False
+    return array
+
+
+class GraphSpec:
+    """
+    Immutable snapshot of a graph.
+
+    Node data is stored in read-only arrays, so a spec can be drawn
+    from many threads at once without locks or copies.
+    """
+
+    __slots__ = ('_type', '_params', '_weights', '_colors', '_palette')
+
+    def __init__(
+        self,
+        type: 'type[Graph]',
+        params: Mapping[str, Any],
+        weights: np.ndarray | None = None,
+        colors: np.ndarray | None = None,
+        palette: tuple[int, ...] = ()
+    ) -> None:
+        """
+        Parameters
+        ----------
+        type: `type[Graph]`
+            Graph class the spec is drawn with.
+        params: `Mapping[str, Any]`
+            Graph parameters. Colors are packed with `pack_color`.
+        weights: `np.ndarray` | `None`
+            Node weights.
+        colors: `np.ndarray` | `None`
+            Node colors packed with `pack_color`.
+            Nodes without a color are set to `NO_COLOR`.
+        palette: `tuple[int, ...]`
+            Packed colors the graph is drawn with.
+        """
+        if weights is None:
+            weights = np.empty(0, dtype=np.float64)
+        if colors is None:
+            colors = np.full(len(weights), NO_COLOR, dtype=np.int64)
+        if len(weights) != len(colors):
+            raise ValueError("weights and colors should have the same length")
+
+        setter = super().__setattr__
+        setter('_type', type)
+        setter('_params', MappingProxyType(dict(params)))
+        setter('_weights', readonly(np.asarray(weights, dtype=np.float64)))
+        setter('_colors', readonly(np.asarray(colors, dtype=np.int64)))
+        setter('_palette', tuple(palette))
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"'{type(self).__name__}' object is immutable")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"'{type(self).__name__}' object is immutable")
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self._params[name]
+        except KeyError:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            ) from None
+
+    def __reduce__(self):
+        return (
+            GraphSpec,
+            (self._type, dict(self._params), self._weights, self._colors, self._palette)
+        )
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, GraphSpec) and self.key == other.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __repr__(self) -> str:
+        return f"<GraphSpec type={self._type.__name__} nodes={len(self._weights)}>"
+
+    @property
+    def type(self) -> 'type[Graph]':
+        """Graph class."""
+        return self._type
+
+    @property
+    def params(self) -> Mapping[str, Any]:
+        """Graph parameters."""
+        return self._params
+
+    @property
+    def weights(self) -> np.ndarray:
+        """Node weights."""
+        return self._weights
+
+    @property
+    def colors(self) -> np.ndarray:
+        """Packed node colors."""
+        return self._colors
+
+    @property
+    def palette(self) -> tuple[int, ...]:
+        """Packed colors the graph is drawn with."""
+        return self._palette
+
+    @property
+    def image_size(self) -> tuple[int, int]:
+        """Size of the image the spec is drawn into."""
+        return self._type._image_size(self)
+
+    @property
+    def key(self) -> str:
+        """Stable hash of the spec. Can be used as a cache key."""
+        return hashlib.sha256(self.dumps()).hexdigest()
+
+    def color(self, name: str) -> Color | None:
+        """
+        Get a color parameter.
+
+        Parameters
+        ----------
+        name: `str`
+            Parameter name.
+        """
+        return unpack_color(self._params[name])
+
+    def node_colors(self) -> list[Color | None]:
+        """Unpack node colors."""
+        return [unpack_color(c) for c in self._colors.tolist()]
+
+    def _header(self) -> bytes:
+        def default(value):
+            raise TypeError(
+                f"parameter of type '{type(value).__name__}'"
+                " cannot be serialized"
+            )
+        
+        return json.dumps(
+            {
+                'type': self._type.__name__,
+                'params': dict(self._params),
+                'palette': self._palette,
+                'count': len(self._weights)
+            },
+            default=default,
+            separators=(',', ':'),
+            sort_keys=True
+        ).encode()
+
+    def dumps(self) -> bytes:
+        """
+        Serialize the spec into a compact binary format.
+        Node data is stored as packed little-endian arrays.
+        """
+        header = self._header()
+        padding = -(_HEADER.size + len(header)) % 8
+
+        return b''.join((
+            _HEADER.pack(MAGIC, VERSION, len(header) + padding),
+            header,
+            b' ' * padding,
+            self._weights.astype('<f8', copy=False).tobytes(),
+            self._colors.astype('<i8', copy=False).tobytes()
+        ))
+
+    @classmethod
+    def loads(cls, data: bytes | bytearray | memoryview) -> 'GraphSpec':
+        """
+        Load a spec serialized with `dumps`.
+        Node arrays are views of `data`, nothing is copied.
+
+        Parameters
+        ----------
+        data: `bytes` | `bytearray` | `memoryview`
+            Serialized spec.
+        """
+        length = memoryview(data).nbytes
+        if length < _HEADER.size:
+            raise ValueError("data is not a graph spec")
+
+        magic, version, size = _HEADER.unpack_from(data)
+
+        if magic != MAGIC:
+            raise ValueError("data is not a graph spec")
+        if version != VERSION:
+            raise ValueError(f"unsupported spec version: {version}")
+        
+        offset = _HEADER.size
+        if length < offset + size:
+            raise ValueError("spec header is truncated")
+
+        try:
+            header = json.loads(bytes(data[offset:offset + size]))
+            type_name = header['type']
+            params = dict(header['params'])
+            palette = tuple(int(c) for c in header['palette'])
+            count = header['count']
+        except (ValueError, TypeError, KeyError) as e:
+            raise ValueError(f"invalid spec header: {e}") from None
+        
+        if not isinstance(count, int) or count < 0:
+            raise ValueError(f"invalid number of nodes: {count}")
+        
+        offset += size
+        if length < offset + count * 16:
+            raise ValueError(f"spec is truncated, {count} nodes expected")
+
+        weights = np.frombuffer(data, '<f8', count, offset)
+        colors = np.frombuffer(data, '<i8', count, offset + count * 8)
+
+        return cls(
+            get_graph_type(type_name),
+            {
+                k: tuple(v) if isinstance(v, list) else v
+                for k, v in params.items()
+            },
+            weights,
+            colors,
+            palette
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the spec into a JSON-compatible dictionary."""
+        return {
+            'type': self._type.__name__,
+            'params': {
+                k: list(v) if isinstance(v, tuple) else v
+                for k, v in self._params.items()
+            },
+            'weights': self._weights.tolist(),
+            'colors': [
+                None if c == NO_COLOR else c 
+                for c in self._colors.tolist()
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'GraphSpec':
+        """
+        Create a spec from a dictionary.
+        Parameters are passed to the graph constructor, so colors
+        can be given in any form the graph accepts.
+
+        Parameters
+        ----------
+        data: `Mapping[str, Any]`
+            Dictionary with `type`, `params` and optional
+            `weights` and `colors` keys. Without `colors`, nodes of graphs
+            filled with node colors (like pie and bar charts) get colors 
+            generated from their index, and other nodes get no color.
+        """
+        graph_type = get_graph_type(data['type'])
+        params = {
+            k: tuple(v) if isinstance(v, list) else v
+            for k, v in data.get('params', {}).items()
+        }
+        weights = data.get('weights', [])
+        default = ... if graph_type._colored_nodes else None
+        colors = data.get('colors', [default] * len(weights))
+
+        spec = graph_type._build(params, weights, colors).freeze()
+        if 'span' in params:
+            # the visible range belongs to the snapshot, so it is put back
+            spec = GraphSpec(
+                spec.type, 
+                spec.params | {'span': params['span']}, 
+                spec.weights, 
+                spec.colors, 
+                spec.palette
+            )
+
+        return spec
+
+    def draw(self) -> Image.Image:
+        """Draw the graph."""
+        return self._type._render(self)
+
+    def draw_sizes(
+        self,
+        sizes: Sequence[Any],
+        *,
+        executor: Executor | None = None
+    ) -> list[Image.Image]:
+        """
+        Draw the graph at several sizes.
+        See `Graph.draw_sizes` for details.
+        """
+        specs = [self._type._resize(self, size) for size in sizes]
+
+        if executor is None:
+            return [spec.draw() for spec in specs]
+        return list(executor.map(GraphSpec.draw, specs))
+
+    def draw_tiles(
+        self,
+        tile: tuple[int, int],
+        *,
+        executor: Executor | None = None,
+        prefetch: int = 4
+    ) -> Iterator[tuple[tuple[int, int, int, int], Image.Image]]:
+        """
+        Draw the graph tile by tile.
+        See `Graph.draw_tiles` for details.
+        """
+        tw, th = tile
+        if tw < 1 or th < 1:
+            raise ValueError("tile size should be positive")
+        if prefetch < 1:
+            raise ValueError("prefetch should be positive")
+        
+        w, h = self.image_size
+        boxes = (
+            (x, y, min(x + tw, w), min(y + th, h))
+            for y in range(0, h, th)
+            for x in range(0, w, tw)
+        )
+        rasterize = partial(
+            self._type._rasterize, 
+            self, 
+            self._type._geometry(self)
+        )
+
+        if executor is None:
+            for box in boxes:
+                yield box, rasterize(box)
+            return
+        
+        pending = deque()
+
+        try:
+            for box in boxes:
+                if len(pending) >= prefetch:
+                    done_box, future = pending.popleft()
+                    yield done_box, future.result()
+                pending.append((box, executor.submit(rasterize, box)))
+            
+            while pending:
+                done_box, future = pending.popleft()
+                yield done_box, future.result()
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    def save_tiled(
+        self,
+        fp: BinaryIO,
+        *,
+        strip: int = 256,
+        compress_level: int = 6,
+        executor: Executor | None = None
+    ) -> None:
+        """
+        Draw the graph into a PNG file strip by strip.
+        See `Graph.save_tiled` for details.
+        """
+        w, h = self.image_size
+        write_png(
+            fp,
+            (w, h),
+            (image for _, image in self.draw_tiles((w, strip), executor=executor)),
+            compress_level=compress_level
+        )
+
+    def render_bytes(
+        self,
+        format: str = 'PNG',
+        *,
+        quality: int | None = None,
+        fp: BinaryIO | None = None
+    ) -> bytes | None:
+        """
+        Draw the graph and encode it.
+        See `Graph.render_bytes` for details.
+        """
+        return encode(
+            self.draw(), 
+            format, 
+            quality=quality, 
+            fp=fp, 
+            maxcolors=len(self._palette) + 1
+        )
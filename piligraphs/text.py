@@ -0,0 +1,118 @@
+from functools import lru_cache
+from PIL import Image, ImageDraw, ImageFont
+
+
+TEXT_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=64)
+def load_font(font: str | None, size: int) -> ImageFont.FreeTypeFont:
+    """
+    Load a font once per process.
+
+    Parameters
+    ----------
+    font: `str` | `None`
+        Path or name of a TrueType font. If `None`, the Pillow default font is used.
+    size: `int`
+        Font size in pixels.
+    """
+    if font is None:
+        return ImageFont.load_default(size)
+    return ImageFont.truetype(font, size)
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def text_mask(
+    text: str,
+    font: str | None = None,
+    size: int = 10,
+    anchor: str = 'la',
+    binary: bool = False
+) -> tuple[Image.Image, tuple[int, int]]:
+    """
+    Rasterize a text into a mask. Masks are kept in a process-wide
+    LRU cache, so repeated labels are rendered only once.
+    Returns the mask and the offset of its corner from the anchor point.
+
+    Parameters
+    ----------
+    text: `str`
+        Text to rasterize.
+    font: `str` | `None`
+        Font path or name. If `None`, the default font is used.
+    size: `int`
+        Font size in pixels.
+    anchor: `str`
+        Pillow text anchor, e.g. `la` or `mm`.
+    binary: `bool`
+        To make the mask black and white for palette images.
+    """
+    loaded = load_font(font, size)
+    x0, y0, x1, y1 = loaded.getbbox(text, anchor=anchor)
+    mask = Image.new('L', (max(x1 - x0, 0), max(y1 - y0, 0)))
+    ImageDraw.Draw(mask).text((-x0, -y0), text, fill=255, font=loaded, anchor=anchor)
+
+    if binary:
+        mask = mask.point(lambda v: 255 if v >= 128 else 0)
+
+    return mask, (x0, y0)
+
+
+def clear_text_cache() -> None:
+    """Drop all cached fonts and text masks."""
+    text_mask.cache_clear()
+    load_font.cache_clear()
+
+
+def paste_text(
+    image: Image.Image,
+    xy: tuple[float, float],
+    text: str,
+    ink: int | tuple,
+    *,
+    font: str | None = None,
+    size: int = 10,
+    anchor: str = 'la',
+    bounds: tuple[int, int] | None = None,
+    offset: tuple[int, int] = (0, 0)
+) -> None:
+    """
+    Draw a text from the cache onto an image.
+
+    Parameters
+    ----------
+    image: `Image.Image`
+        Image to draw on.
+    xy: `tuple[float, float]`
+        Anchor point.
+    text: `str`
+        Text to draw.
+    ink: `int` | `tuple`
+        Ink in the image mode.
+    font: `str` | `None`
+        Font path or name. If `None`, the default font is used.
+    size: `int`
+        Font size in pixels.
+    anchor: `str`
+        Pillow text anchor.
+    bounds: `tuple[int, int]` | `None`
+        Width and height of the area the text is moved into if it sticks out.
+    offset: `tuple[int, int]`
+        Origin of the image inside that area, e.g. the corner of a tile.
+    """
+    mask, (dx, dy) = text_mask(text, font, size, anchor, image.mode == 'P')
+    x = int(xy[0]) + dx
+    y = int(xy[1]) + dy
+
+    if bounds is not None:
+        x = min(max(x, 0), bounds[0] - mask.width)
+        y = min(max(y, 0), bounds[1] - mask.height)
+
+    image.paste(ink, (x - offset[0], y - offset[1]), mask)
+
+
+def format_tick(value: float) -> str:
+    """Format a tick value into a short label."""
+    # rounding drops float noise like 1e-17 and negative zeros
+    return f'{round(value, 12) + 0.0:.4g}'
@@ -1,7 +1,13 @@
+import ast
 import math
+import struct
+import zlib
 import numpy as np
+from functools import lru_cache
+from io import BytesIO
+from PIL import Image
 from scipy.interpolate import interp1d
-from typing import Literal
+from typing import BinaryIO, Callable, Iterable, Literal
 
 
 Interpolation = Literal[
@@ -74,6 +80,67 @@ def interpolate(
     return list(zip(x_new, y_new))
 
 
+def clip_points(points: np.ndarray, minx: float, maxx: float) -> np.ndarray:
+    """
+    Select points of a polyline sorted by x that are needed to draw it 
+    between `minx` and `maxx`, including one point beyond each side.
+
+    Parameters
+    ----------
+    points: `np.ndarray`
+        Array of points with shape `(n, 2)`.
+    minx: `float`
+        Left edge.
+    maxx: `float`
+        Right edge.
+    """
+    xs = points[:, 0]
+    start = max(np.searchsorted(xs, minx) - 1, 0)
+    end = min(np.searchsorted(xs, maxx, side='right') + 1, len(xs))
+    return points[start:end]
+
+
+def to_points(
+    points: np.ndarray, 
+    offset: tuple[float, float] = (0, 0)
+) -> list[tuple[float, float]]:
+    """
+    Convert an array of points into a list of tuples for drawing.
+
+    Parameters
+    ----------
+    points: `np.ndarray`
+        Array of points with shape `(n, 2)`.
+    offset: `tuple[float, float]`
+        Origin of the image the points are drawn on.
+    """
+    # points are floored before Pillow truncates them towards zero,
+    # so shifted points land on the same pixels as unshifted ones
+    points = np.floor(points - offset)
+    return list(map(tuple, points.tolist()))
+
+
+def to_boxes(
+    points: np.ndarray, 
+    radius: float, 
+    offset: tuple[float, float] = (0, 0)
+) -> list[tuple[float, float, float, float]]:
+    """
+    Convert an array of points into a list of boxes of circles around them.
+
+    Parameters
+    ----------
+    points: `np.ndarray`
+        Array of points with shape `(n, 2)`.
+    radius: `float`
+        Circle radius.
+    offset: `tuple[float, float]`
+        Origin of the image the circles are drawn on.
+    """
+    boxes = np.floor(np.hstack((points - radius, points + radius)) - (*offset, *offset))
+    return list(map(tuple, boxes.tolist()))
+
+
 def limit(
     values: list[int | float],
     minv: int | float,
@@ -96,7 +163,7 @@ def limit(
         Copy an array or not.
     """
     array = np.array(values, copy=copy)
-    _min, _max = min(array), max(array)
+    _min, _max = array.min(), array.max()
 
     if _max == _min:
         return array
@@ -135,4 +202,217 @@ def linear_to_circle(
     return [
         circle_xy(radius, rad, i * ang + angle)
         for i, rad in enumerate(radii)
-    ]
\ No newline at end of file
+    ]
+
+
+def to_palette(image: Image.Image, maxcolors: int = 256) -> Image.Image | None:
+    """
+    Convert an RGBA image to palette mode without losing any color.
+    Returns `None` if the image contains more than `maxcolors` colors.
+
+    Parameters
+    ----------
+    image: `Image.Image`
+        RGBA image.
+    maxcolors: `int`
+        Maximum number of colors. Can't be greater than 256.
+    """
+    colors = image.getcolors(min(maxcolors, 256))
+
+    if colors is None:
+        return None
+
+    palette = np.array([c for _, c in colors], dtype=np.uint8)
+    keys = palette.view(np.uint32).ravel()
+    order = np.argsort(keys)
+    pixels = np.asarray(image).view(np.uint32)[..., 0]
+    indices = order[np.searchsorted(keys[order], pixels)].astype(np.uint8)
+
+    result = Image.frombytes('P', image.size, indices.tobytes())
+    result.putpalette(palette.tobytes(), 'RGBA')
+
+    return result
+
+
+def encode(
+    image: Image.Image,
+    format: str = 'PNG',
+    *,
+    quality: int | None = None,
+    fp: BinaryIO | None = None,
+    maxcolors: int = 256
+) -> bytes | None:
+    """
+    Encode an image. RGBA images with at most `maxcolors` colors
+    are stored with an exact palette in PNG and GIF.
+
+    Parameters
+    ----------
+    image: `Image.Image`
+        Image to encode.
+    format: `str`
+        Image format.
+    quality: `int` | `None`
+        Encoding quality from 0 to 100.
+    fp: `BinaryIO` | `None`
+        File-like object to write into.
+        If `None`, encoded bytes are returned.
+    maxcolors: `int`
+        Maximum number of colors to build a palette for.
+    """
+    fmt = format.upper()
+    params = {}
+
+    if fmt in {'PNG', 'GIF'} and image.mode == 'RGBA':
+        palette = to_palette(image, maxcolors)
+        if palette is not None:
+            image = palette
+
+    if fmt == 'PNG':
+        if quality is not None:
+            params['compress_level'] = round(quality / 100 * 9)
+    elif fmt == 'WEBP':
+        if quality is None:
+            params['lossless'] = True
+        else:
+            params['quality'] = quality
+    elif fmt == 'JPEG':
+        image = image.convert('RGB')
+        if quality is not None:
+            params['quality'] = quality
+    elif quality is not None:
+        params['quality'] = quality
+
+    if fp is not None:
+        image.save(fp, fmt, **params)
+        return None
+
+    buffer = BytesIO()
+    image.save(buffer, fmt, **params)
+    return buffer.getvalue()
+
+
+_EXPR_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load,
+    ast.Constant, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv,
+    ast.Mod, ast.Pow, ast.USub, ast.UAdd
+)
+_EXPR_NAMES = {
+    name: getattr(math, name) for name in dir(math) 
+    if not name.startswith('_')
+} | {'abs': abs, 'min': min, 'max': max}
+
+
+@lru_cache(maxsize=256)
+def compile_func(expr: str, /) -> Callable[[float], float]:
+    """
+    Compile a math expression of `x` into a function.
+    Only arithmetic and `math` module functions are allowed.
+
+    Parameters
+    ----------
+    expr: `str`
+        Expression, e.g. `sin(x) * x ** 2`.
+    """
+    try:
+        tree = ast.parse(expr, mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"invalid expression: {expr}") from e
+
+    for node in ast.walk(tree):
+        if not isinstance(node, _EXPR_NODES):
+            raise ValueError(
+                f"'{type(node).__name__}' is not allowed in expressions"
+            )
+        if isinstance(node, ast.Name) and node.id != 'x' and node.id not in _EXPR_NAMES:
+            raise ValueError(f"unknown name in expression: {node.id}")
+        if isinstance(node, ast.Call) and (node.keywords or not isinstance(node.func, ast.Name)):
+            raise ValueError("only plain function calls are allowed in expressions")
+        if isinstance(node, ast.Constant):
+            if not isinstance(node.value, (int, float)) or isinstance(node.value, bool):
+                raise ValueError(f"unsupported constant in expression: {node.value!r}")
+            # float constants overflow instead of building huge integers
+            node.value = float(node.value)
+
+    code = compile(tree, '<expr>', 'eval')
+    namespace = {'__builtins__': {}} | _EXPR_NAMES
+
+    return lambda x: eval(code, namespace, {'x': x})
+
+
+_PNG_COLOR_TYPES = {'L': 0, 'P': 3, 'LA': 4, 'RGBA': 6}
+
+
+def _png_chunk(fp: BinaryIO, tag: bytes, data: bytes) -> None:
+    fp.write(struct.pack('>I', len(data)))
+    fp.write(tag)
+    fp.write(data)
+    fp.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(tag))))
+
+
+def write_png(
+    fp: BinaryIO,
+    size: tuple[int, int],
+    strips: Iterable[Image.Image],
+    *,
+    compress_level: int = 6
+) -> None:
+    """
+    Write a PNG image from horizontal strips, top to bottom.
+    Strips are compressed one by one, the full image is never built.
+    All strips should have the image width and the same mode.
+
+    Parameters
+    ----------
+    fp: `BinaryIO`
+        File-like object to write into.
+    size: `tuple[int, int]`
+        Image width and height.
+    strips: `Iterable[Image.Image]`
+        Image strips.
+    compress_level: `int`
+        Compression level from 0 to 9.
+    """
+    w, h = size
+    compressor = zlib.compressobj(compress_level)
+    rows = 0
+
+    fp.write(b'\x89PNG\r\n\x1a\n')
+
+    for strip in strips:
+        if strip.width != w:
+            raise ValueError("strip width should be equal to image width")
+        
+        if rows == 0:
+            mode = strip.mode
+            if mode not in _PNG_COLOR_TYPES:
+                raise ValueError(f"unsupported image mode: {mode}")
+            
+            _png_chunk(
+                fp, 
+                b'IHDR', 
+                struct.pack('>IIBBBBB', w, h, 8, _PNG_COLOR_TYPES[mode], 0, 0, 0)
+            )
+
+            if mode == 'P':
+                palette = np.array(strip.getpalette('RGBA'), dtype=np.uint8).reshape(-1, 4)
+                _png_chunk(fp, b'PLTE', palette[:, :3].tobytes())
+                _png_chunk(fp, b'tRNS', palette[:, 3].tobytes())
+        elif strip.mode != mode:
+            raise ValueError("all strips should have the same mode")
+
+        pixels = np.frombuffer(strip.tobytes(), dtype=np.uint8).reshape(strip.height, -1)
+        # every row starts with filter type 0 (none)
+        data = np.zeros((strip.height, pixels.shape[1] + 1), dtype=np.uint8)
+        data[:, 1:] = pixels
+        rows += strip.height
+
+        compressed = compressor.compress(data.tobytes())
+        if compressed:
+            _png_chunk(fp, b'IDAT', compressed)
+
+    if rows != h:
+        raise ValueError(f"strips contain {rows} rows instead of {h}")
+
+    _png_chunk(fp, b'IDAT', compressor.flush())
+    _png_chunk(fp, b'IEND', b'')
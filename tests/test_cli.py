@@ -0,0 +1,16 @@
+import pytest
+
+from piligraphs.__main__ import main
+
+
+def test_render_missing_input(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main([
+            'render', str(tmp_path / 'missing.csv'), 
+            '-o', str(tmp_path / 'charts'), 
+            '-p', '{"size": [10, 10]}', 
+            '--quiet'
+        ])
+
+    assert exit_info.value.code == 2
+    assert 'missing.csv' in capsys.readouterr().err
@@ -0,0 +1,24 @@
+import numpy as np
+
+from piligraphs import DensityChart
+
+
+def test_points_on_bounds():
+    chart = DensityChart((4, 2), bounds=(0, 0, 1, 1), scale='linear')
+    chart.add_points(
+        np.array([0.0, 1.0, 0.5, 0.5, 0.0, 1.0]),
+        np.array([0.5, 0.5, 0.0, 1.0, 0.0, 1.0])
+    )
+
+    assert chart.counts.sum() == 6
+    assert chart.counts.tolist() == [
+        [0, 0, 1, 1],
+        [2, 0, 1, 1]
+    ]
+
+
+def test_points_outside_bounds():
+    chart = DensityChart((4, 2), bounds=(0, 0, 1, 1))
+    chart.add_points(np.array([-0.1, 1.1, 0.5, 0.5]), np.array([0.5, 0.5, -0.1, 1.1]))
+
+    assert chart.counts.sum() == 0
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from piligraphs import LineChart, Node, SeriesIndex
+from piligraphs import linechart
+
+
+@pytest.fixture
+def x_labels(monkeypatch):
+    texts = []
+
+    def paste_text(image, xy, text, *args, anchor=None, **kwargs):
+        # x labels are anchored at the middle bottom
+        if anchor == 'md':
+            texts.append(text)
+
+    monkeypatch.setattr(linechart, 'paste_text', paste_text)
+    return texts
+
+
+def test_labels_of_viewport(x_labels):
+    graph = LineChart((400, 100), labels='000000', ticks=(4, 2))
+    graph.source = np.arange(1_000_000, dtype=np.float64)
+
+    spec = graph.freeze((500_000, 600_000))
+    assert spec.span == (500_000, 600_000)
+
+    spec.draw()
+    assert x_labels == ['5e+05', '5.25e+05', '5.5e+05', '5.75e+05', '6e+05']
+
+
+def test_labels_of_reduced_source(x_labels):
+    graph = LineChart((400, 100), labels='000000', ticks=(4, 2))
+    graph.source = iter(np.array_split(np.arange(5001, dtype=np.float64), 7))
+
+    graph.draw()
+    assert x_labels == ['0', '1250', '2500', '3750', '5000']
+
+
+def test_labels_of_series_index_viewport(x_labels):
+    graph = LineChart((400, 100), labels='000000', ticks=(4, 2))
+    graph.source = SeriesIndex(np.arange(1000.0), x=np.linspace(0, 10, 1000))
+
+    graph.draw((2, 4))
+    assert x_labels == ['2', '2.5', '3', '3.5', '4']
+
+
+def test_labels_of_node_viewport(x_labels):
+    graph = LineChart((400, 100), labels='000000', ticks=(4, 2))
+    graph.add_nodes(*(Node(weight=i) for i in range(10)))
+
+    graph.draw((3, 7))
+    assert x_labels == ['3', '4', '5', '6', '7']
@@ -0,0 +1,28 @@
+import pickle
+
+from pinkie import Color
+
+from piligraphs import Node, PieChart
+
+
+def test_generated_color_matches_graph():
+    first, second = Node(weight=2), Node(weight=3, color='ff0000')
+    graph = PieChart(50)
+    graph.add_nodes(first, second)
+
+    assert first.generated and not second.generated
+    assert isinstance(first.color, Color)
+    assert [first.color, second.color] == graph.node_colors()
+
+
+def test_generated_color_without_graph():
+    assert isinstance(Node().color, Color)
+
+
+def test_pickled_graph_keeps_node_colors():
+    graph = PieChart(50)
+    graph.add_nodes(Node(), Node())
+
+    restored = pickle.loads(pickle.dumps(graph))
+
+    assert [node.color for node in restored.nodes] == graph.node_colors()
@@ -0,0 +1,50 @@
+import http.client
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from piligraphs import LineChart, Node
+from piligraphs.server import RenderServer
+
+
+@pytest.fixture
+def server():
+    with ThreadPoolExecutor(1) as executor:
+        with RenderServer(('127.0.0.1', 0), executor=executor) as server:
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            yield server
+            server.shutdown()
+
+
+def post(server, body: bytes, content_type: str) -> tuple[int, bytes]:
+    connection = http.client.HTTPConnection(*server.server_address)
+    try:
+        connection.request('POST', '/render', body, {'Content-Type': content_type})
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+
+def test_render_binary_spec(server):
+    graph = LineChart((40, 20))
+    graph.add_nodes(*(Node(weight=i) for i in range(5)))
+
+    status, body = post(server, graph.to_spec(), 'application/octet-stream')
+
+    assert status == 200
+    assert body.startswith(b'\x89PNG')
+
+
+@pytest.mark.parametrize('size', [0, 5, 12, 40, -8])
+def test_truncated_binary_spec(server, size):
+    graph = LineChart((40, 20))
+    graph.add_nodes(*(Node(weight=i) for i in range(5)))
+
+    status, body = post(server, graph.to_spec()[:size], 'application/octet-stream')
+
+    assert status == 400
+    assert 'error' in json.loads(body)
@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+from piligraphs import BarChart, Node
+from piligraphs.shared import SharedRenderer
+
+
+def test_drawing_error_comes_through():
+    chart = BarChart((20, 10))
+    chart.add_nodes(Node(weight=1), Node(weight=-1))
+
+    with SharedRenderer(workers=1) as renderer:
+        with pytest.raises(ValueError, match="should not be negative"):
+            renderer.submit(chart).result()
+
+
+@pytest.mark.skipif(not os.path.isdir('/dev/shm'), reason="segments are not listed")
+def test_submit_to_closed_pool():
+    chart = BarChart((20, 10))
+    chart.add_nodes(Node(weight=1))
+
+    renderer = SharedRenderer(workers=1)
+    renderer.close()
+    segments = set(os.listdir('/dev/shm'))
+
+    with pytest.raises(RuntimeError):
+        renderer.submit(chart)
+
+    # segments created for the graph are removed
+    assert set(os.listdir('/dev/shm')) <= segments
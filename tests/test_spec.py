@@ -0,0 +1,13 @@
+from piligraphs import LineChart, Node
+
+
+def test_draw_sizes_match_resized_draws():
+    graph = LineChart((300, 100), thickness=3, npoints='auto', interp='cubic')
+    graph.add_nodes(*(Node(weight=i % 7) for i in range(30)))
+    sizes = [(100, 40), (600, 200), (250, 90)]
+
+    images = graph.draw_sizes(sizes)
+
+    for size, image in zip(sizes, images):
+        graph.size = size
+        assert image.tobytes() == graph.draw().tobytes()